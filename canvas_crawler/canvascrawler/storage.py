@@ -4,6 +4,28 @@ import requests
 import zipfile
 import hashlib
 import re
+from contextlib import contextmanager
+
+
+@contextmanager
+def _atomic_open(path, mode, **kwargs):
+    """
+    Write to a hidden .part file next to path and rename it over path once
+    complete, so anything watching the output tree (the orchestrator's
+    pipelined conversion skips dotfiles) only ever sees finished files.
+    """
+    d, name = os.path.split(path)
+    tmp = os.path.join(d, f".{name}.part")
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 
 class StorageManager:
@@ -84,7 +106,7 @@ class StorageManager:
 
                     # extract by streaming; also compute sha256 if you want
                     sha = hashlib.sha256()
-                    with zf.open(info, "r") as src, open(dest_path, "wb") as out:
+                    with zf.open(info, "r") as src, _atomic_open(dest_path, "wb") as out:
                         for chunk in iter(lambda: src.read(1024 * 1024), b""):
                             out.write(chunk)
                             sha.update(chunk)
@@ -204,7 +226,7 @@ class StorageManager:
         
         path = os.path.join(self.base_dir, "json_output", filename)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
+        with _atomic_open(path, "w", encoding="utf-8") as f:
             json.dump(record, f, indent=2)
         self.logger.debug(f"Wrote JSON -> {path}")
 
@@ -216,7 +238,7 @@ class StorageManager:
         """
         path = os.path.join(self.base_dir, json_rel_path.lstrip("/"))
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
+        with _atomic_open(path, "w", encoding="utf-8") as f:
             json.dump(record, f, indent=2)
         self.logger.debug(f"Wrote JSON -> {path}")
         return path
@@ -227,7 +249,7 @@ class StorageManager:
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
         r = requests.get(url, stream=True)
         r.raise_for_status()
-        with open(full_path, "wb") as f:
+        with _atomic_open(full_path, "wb") as f:
             for chunk in r.iter_content(1024):
                 f.write(chunk)
         self.logger.debug(f"Downloaded file -> {full_path}")
@@ -237,6 +259,6 @@ class StorageManager:
     def write_html(self, content, file_path):
         path = os.path.join(self.base_dir, file_path.lstrip("/"))
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
+        with _atomic_open(path, "w", encoding="utf-8") as f:
             f.write(content)
         self.logger.debug(f"Wrote HTML -> {path}")
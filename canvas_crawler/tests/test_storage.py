@@ -0,0 +1,22 @@
+import logging
+import os
+
+import pytest
+from canvas_crawler.canvascrawler.storage import StorageManager
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageManager(str(tmp_path), logging.getLogger("test_storage"))
+
+
+def test_write_html_leaves_no_part_file(storage, tmp_path):
+    storage.write_html("<p>hi</p>", "pages/a.html")
+    assert (tmp_path / "pages" / "a.html").read_text() == "<p>hi</p>"
+    assert os.listdir(tmp_path / "pages") == ["a.html"]
+
+
+def test_failed_write_keeps_final_name_absent(storage, tmp_path):
+    with pytest.raises(TypeError):
+        storage.write_json({"type": "page", "id": 1, "bad": object()})
+    assert os.listdir(tmp_path / "json_output") == []
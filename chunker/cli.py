@@ -11,7 +11,7 @@ from .pipeline import run_chunking
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Chunk markdown documents referenced by Canvas JSON records.")
-    p.add_argument("--config", default=None, help="Path to pipeline config.yml (optional).")
+    p.add_argument("--config", default=None, help="Path to pipeline config.yml or config_used.json (optional).")
 
     p.add_argument("--master-run", required=True, help="Path to master run dir (runs/<ts>).")
     p.add_argument("--json-output", required=True, help="Path to json_output dir for the course run.")
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 @dataclass(frozen=True)
 class OutputConfig:
     out_dirname: str = "chunker"
@@ -42,7 +53,13 @@ class ChunkingConfig:
 
 
 def load_config(path: Path) -> Dict[str, Any]:
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    raw = path.read_bytes()
+    # The orchestrator passes its parsed config as config_used.json; no YAML parse needed.
+    if path.suffix.lower() == ".json":
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return data or {}
+
+    return yaml.load(raw, Loader=_YamlLoader) or {}
 
 
 def parse_chunking_config(cfg: Dict[str, Any]) -> ChunkingConfig:
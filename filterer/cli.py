@@ -4,52 +4,183 @@ import argparse
 import csv
 import hashlib
 import json
+import mmap
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, Iterable
+from typing import Optional, Dict, Any, Iterable, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 
 _TEXT_SUFFIXES = {".html", ".htm", ".txt", ".md", ".json"}
 
+# Files at least this large are hashed through mmap instead of read_bytes()
+_MMAP_HASH_THRESHOLD = 8 * 1024 * 1024
+
 # Default blacklist
 _DEFAULT_TITLE_BLACKLIST = {
     "midterm", "exam", "solution", "sol", "explanation", 
     "key", "answers","check-in","checkin","check in",
 }
 
-def _estimate_token_count(text: str) -> int:
+# Byte -> 0 for whitespace, 1 for anything else (see _estimate_token_count).
+# Same ASCII set as str.isspace(), which includes the \x1c-\x1f separators.
+_TOKEN_MARKS = bytes(0 if chr(b).isspace() else 1 for b in range(128)) + bytes(128)
+
+def _estimate_token_count(data: bytes) -> int:
     """
-    Very rough token count: split on non-whitespace.
+    Very rough token count: runs of non-whitespace.
     If you later want model-accurate tokens, you can plug tiktoken in here.
+
+    ASCII data (the common case) is counted on the raw bytes, so nothing is
+    decoded and no per-token list is built: translate() maps every byte to
+    0/1 and each 0 -> 1 transition starts a token, which bytes.count() finds
+    in a single C pass. Anything else is decoded and split, since Unicode
+    whitespace (NBSP, em space, ...) also separates tokens.
+    """
+    if not data:
+        return 0
+    if not data.isascii():
+        return len(data.decode("utf-8", errors="ignore").split())
+    marks = data.translate(_TOKEN_MARKS)
+    return marks.count(b"\x00\x01") + (marks[0] == 1)
+
+def _sha256_mmap(p: Path) -> Optional[str]:
+    """
+    SHA-256 hex digest of a large file, or None if it can't be read.
+
+    The file is memory-mapped rather than read so peak RSS stays bounded;
+    hashlib releases the GIL while hashing big buffers.
+    """
+    try:
+        with p.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return hashlib.sha256(mm).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+# (reason, extra event fields) returned by a filter stage in run_filtering
+_StageHit = tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class _FileProbe:
+    """
+    Per-file I/O results, computed ahead of the decision loop (possibly on a
+    worker thread).
+
+    - sha256: content hash (only when dedupe is enabled)
+    - token_count: estimated tokens (only when the token filter needs a count)
+    """
+    sha256: Optional[str] = None
+    token_count: Optional[int] = None
+
+
+def _probe_file(
+    p: Path,
+    *,
+    want_hash: bool,
+    min_tokens: Optional[int],
+    max_tokens: Optional[int],
+) -> _FileProbe:
+    probe = _FileProbe()
+
+    try:
+        size: Optional[int] = p.stat().st_size
+    except OSError:
+        size = None
+
+    # Every token is at least one byte, so the file size bounds the token
+    # count from above: with only a max limit, a file of at most max_tokens
+    # bytes can never be too large and is not read. Files under min_tokens
+    # bytes are still counted (they are tiny) so "small" events carry
+    # their token_count.
+    need_count = False
+    if (min_tokens is not None or max_tokens is not None) and p.suffix.lower() in _TEXT_SUFFIXES:
+        need_count = not (size is not None and min_tokens is None and size <= max_tokens)
+
+    # Read the bytes once and share them between hashing and token counting;
+    # only large files that just need a hash go through mmap instead.
+    data: Optional[bytes] = None
+    if need_count or (want_hash and size is not None and size < _MMAP_HASH_THRESHOLD):
+        try:
+            data = p.read_bytes()
+        except OSError:
+            data = None
+
+    if want_hash:
+        if data is not None:
+            probe.sha256 = hashlib.sha256(data).hexdigest()
+        elif size is not None and size >= _MMAP_HASH_THRESHOLD:
+            probe.sha256 = _sha256_mmap(p)
+
+    if need_count:
+        probe.token_count = _estimate_token_count(data or b"")
+
+    return probe
+
+def _dump_json_bytes(data: Any) -> bytes:
     """
-    return len(re.findall(r"\S+", text))
+    Serialize to indented UTF-8 JSON.
+
+    Uses orjson when installed: stdlib json drops to its pure-Python encoder
+    whenever indent is set, orjson keeps OPT_INDENT_2 in C.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+def _iter_json_items(data: Any) -> Iterable[Dict[str, Any]]:
+    """
+    Yield the item dicts of a parsed metadata JSON file.
+
+    Possible shapes:
+      1) Top-level list of items
+      2) Top-level dict
+         a) Single item dict with raw_file_path
+         b) Container dict with "items" list
+    """
+    if isinstance(data, list):
+        for obj in data:
+            if isinstance(obj, dict):
+                yield obj
+
+    elif isinstance(data, dict):
+        if "raw_file_path" in data:
+            yield data
+
+        items = data.get("items")
+        if isinstance(items, list):
+            for obj in items:
+                if isinstance(obj, dict):
+                    yield obj
+
 
 def _annotate_json_removal(
     *,
-    course_root: Path,
-    json_rel_str: str,
+    data: Any,
     meta: Dict[str, Any],
     event: Dict[str, Any],
 ) -> None:
     """
     Mark the JSON item corresponding to this file as removed.
 
+    `data` is the parsed JSON file (as cached by _load_metadata_index); it is
+    mutated in place and written back later by _write_json_docs.
+
     - Finds the entry with matching raw_file_path
     - Sets `removed = True`
     - Sets `removal_reason` from event["reason"]
     - Copies some extra event fields (token_count, suffix, blacklisted_term, dupe_of, etc.)
     """
-    json_path = (course_root / json_rel_str).resolve()
-    if not json_path.exists():
-        return
-
-    try:
-        raw = json_path.read_text(encoding="utf-8")
-        data = json.loads(raw)
-    except Exception:
-        # Don't kill the run if a JSON can't be read/parsed
-        return
-
     raw_file_path = meta.get("raw_file_path")
     if not isinstance(raw_file_path, str):
         return
@@ -57,11 +188,9 @@ def _annotate_json_removal(
     # Which event fields do we want to propagate into the item?
     extra_keys = ("token_count", "suffix", "blacklisted_term", "dupe_of")
 
-    def mark_item(item: Dict[str, Any]) -> None:
-        if not isinstance(item, dict):
-            return
+    for item in _iter_json_items(data):
         if item.get("raw_file_path") != raw_file_path:
-            return
+            continue
 
         item["removed"] = True
         item["removal_reason"] = event.get("reason")
@@ -71,38 +200,29 @@ def _annotate_json_removal(
             if key in event:
                 item[f"removal_{key}"] = event[key]
 
-    # Possible shapes:
-    # 1) Top-level list of items
-    if isinstance(data, list):
-        for obj in data:
-            if isinstance(obj, dict):
-                mark_item(obj)
 
-    # 2) Top-level dict
-    elif isinstance(data, dict):
-        # a) Single item dict with raw_file_path
-        if "raw_file_path" in data:
-            mark_item(data)
+def _write_json_docs(course_root: Path, json_docs: Dict[str, Any]) -> None:
+    """
+    Write cached JSON files (relative path -> parsed data) back to disk.
 
-        # b) Container dict with "items" list
-        items = data.get("items")
-        if isinstance(items, list):
-            for obj in items:
-                if isinstance(obj, dict):
-                    mark_item(obj)
+    The `_json_path` bookkeeping key added by _load_metadata_index is stripped
+    so the files keep their original shape.
+    """
+    for json_rel_str, data in sorted(json_docs.items()):
+        for item in _iter_json_items(data):
+            item.pop("_json_path", None)
 
-    # Write the updated JSON back
-    try:
-        json_path.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-    except Exception:
-        # If writing fails, just continue
-        return
+        json_path = (course_root / json_rel_str).resolve()
+        if not json_path.exists():
+            continue
+        try:
+            json_path.write_bytes(_dump_json_bytes(data))
+        except Exception:
+            # If writing fails, just continue
+            continue
 
 
-def _read_exclusion_csv(course_root: Path, csv_path: Path) -> set[Path]:
+def _read_exclusion_csv(course_root: Path, csv_path: Path) -> set[str]:
     """
     Load a CSV of files to exclude.
 
@@ -112,47 +232,63 @@ def _read_exclusion_csv(course_root: Path, csv_path: Path) -> set[Path]:
       - path
 
     Paths should be relative to course_root, e.g. 'pages/120231.html'.
+
+    Returns resolved absolute paths as strings: str hashes are cached on the
+    object, so membership tests in the per-file loop stay cheap.
     """
     csv_path = csv_path.resolve()
     if not csv_path.exists():
         raise FileNotFoundError(f"Exclusion CSV not found: {csv_path}")
 
-    with csv_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        fieldnames = [fn.strip() for fn in (reader.fieldnames or [])]
+    # Only one column is used, so a plain csv.reader (no per-row dict) with
+    # a large read buffer is enough.
+    with csv_path.open("r", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        headers = [h.strip() for h in next(reader, [])]
 
-        path_key: Optional[str] = None
+        col_idx: Optional[int] = None
         for candidate in ("raw_file_path", "file_path", "path"):
-            if candidate in fieldnames:
-                path_key = candidate
+            if candidate in headers:
+                col_idx = headers.index(candidate)
                 break
 
-        if path_key is None:
-            # fallback to the first column
-            f.seek(0)
-            first_line = next(f).strip()
-            if not first_line:
-                return set()
-            headers = [h.strip() for h in first_line.split(",") if h.strip()]
-            if not headers:
+        if col_idx is None:
+            # fallback to the first (non-empty) column
+            non_empty = [i for i, h in enumerate(headers) if h]
+            if not non_empty:
                 return set()
-            path_key = headers[0]
-            f.seek(0)
-            reader = csv.DictReader(f)
+            col_idx = non_empty[0]
 
-        rel_paths: set[Path] = set()
+        rel_paths: set[str] = set()
         for row in reader:
-            raw_val = (row.get(path_key) or "").strip()
-            if not raw_val:
+            if len(row) <= col_idx:
                 continue
-            rel_paths.add(Path(raw_val))
+            raw_val = row[col_idx].strip()
+            if raw_val:
+                rel_paths.add(raw_val)
 
-    return {(course_root / p).resolve() for p in rel_paths}
+    return {str((course_root / p).resolve()) for p in rel_paths}
 
 
-def _should_skip(path: Path, root: Path, skip_dirnames: set[str]) -> bool:
-    rel = path.relative_to(root)
-    return any(part in skip_dirnames for part in rel.parts)
+def _dirname_patterns(
+    skip_dirnames: Iterable[str],
+    include_dirnames: Optional[Iterable[str]],
+) -> tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+    """
+    Compile skip/include dirnames into matchers for '/'-joined relative paths.
+
+    skip matches any path component; include matches the first one. An empty
+    skip set compiles to None (nothing skipped); include None means "all".
+    """
+    skip_re = None
+    if skip_dirnames:
+        alt = "|".join(re.escape(s) for s in sorted(skip_dirnames))
+        skip_re = re.compile(r"(?:^|/)(?:" + alt + r")(?:/|$)")
+    include_re = None
+    if include_dirnames is not None:
+        alt = "|".join(re.escape(i) for i in sorted(include_dirnames))
+        include_re = re.compile(r"^(?:" + alt + r")(?:/|$)")
+    return skip_re, include_re
 
 
 def _discover_files_under(
@@ -168,28 +304,34 @@ def _discover_files_under(
     If include_dirnames is provided, only include files whose *top-level* folder
     (relative to root) is in include_dirnames. Root-level files (no parent dir)
     are always included.
+
+    Both sets are compiled once into regexes matched against each entry's
+    relative path; skipped or excluded directories are pruned before they are
+    opened. Files come back in the same order as root.rglob("*").
     """
+    skip_re, include_re = _dirname_patterns(skip_dirnames, include_dirnames)
     files: list[Path] = []
-    for p in root.rglob("*"):
-        if not p.is_file():
-            continue
-        if _should_skip(p, root, skip_dirnames):
-            continue
 
-        rel = p.relative_to(root)
-
-        # Root-level files are included by default
-        if len(rel.parts) == 1:
-            files.append(p.resolve())
-            continue
+    def walk(d: str, rel_prefix: str) -> None:
+        subdirs: list[tuple[str, str]] = []
+        with os.scandir(d) as it:
+            for e in it:
+                rel = rel_prefix + e.name
+                if skip_re is not None and skip_re.search(rel):
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    if not rel_prefix and include_re is not None and not include_re.match(rel):
+                        continue
+                    subdirs.append((e.path, rel + "/"))
+                elif e.is_file():
+                    files.append(Path(e.path).resolve())
+        for sub, sub_rel in subdirs:
+            walk(sub, sub_rel)
 
-        top = rel.parts[0]
-        if include_dirnames is not None and top not in include_dirnames:
-            continue
+    walk(os.fspath(root), "")
+    return files
 
-        files.append(p.resolve())
 
-    return files
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Filter crawled Canvas course files")
 
@@ -302,6 +444,12 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         default=2000,
         help="Max removed file entries to embed in summary JSON (set 0 to disable).",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Threads used to hash/read files ahead of filtering (1 = sequential).",
+    )
 
     return p.parse_args(argv)
 
@@ -328,27 +476,53 @@ def _suffix_set_from_csv(s: Optional[str]) -> set[str]:
         out.add(p)
     return out
 
-def _log_event(
-    *,
-    event: Dict[str, Any],
-    log_removed: bool,
-    jsonl_fp,
-) -> None:
+class _RemovalLog:
     """
+    Buffered output for removal events.
+
+    Console lines (--log-removed) and JSONL lines (--log-removed-to) are
+    collected and written in batches, one write per stream per batch, instead
+    of a print()/write() call per event. Call flush() before closing jsonl_fp.
+
     event keys: action, reason, path, (optional) dupe_of, token_count, suffix
     """
-    if log_removed:
-        extra = ""
-        if event.get("dupe_of"):
-            extra = f" (dupe_of={event['dupe_of']})"
-        if event.get("token_count") is not None:
-            extra += f" (tokens={event['token_count']})"
-        print(f"[filterer] {event['action']}: {event['reason']}: {event['path']}{extra}")
-
-    if jsonl_fp is not None:
-        jsonl_fp.write(json.dumps(event, ensure_ascii=False) + "\n")
-
-def _load_metadata_index(course_root: Path) -> Dict[Path, Dict[str, Any]]:
+
+    def __init__(self, *, log_removed: bool, jsonl_fp, batch_size: int = 1000) -> None:
+        self.log_removed = log_removed
+        self.jsonl_fp = jsonl_fp
+        self.batch_size = batch_size
+        self._console: list[str] = []
+        self._jsonl: list[str] = []
+
+    def add(self, event: Dict[str, Any]) -> None:
+        if self.log_removed:
+            extra = ""
+            if event.get("dupe_of"):
+                extra = f" (dupe_of={event['dupe_of']})"
+            if event.get("token_count") is not None:
+                extra += f" (tokens={event['token_count']})"
+            self._console.append(
+                f"[filterer] {event['action']}: {event['reason']}: {event['path']}{extra}\n"
+            )
+
+        if self.jsonl_fp is not None:
+            self._jsonl.append(json.dumps(event, ensure_ascii=False) + "\n")
+
+        if len(self._console) >= self.batch_size or len(self._jsonl) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._console:
+            sys.stdout.write("".join(self._console))
+            sys.stdout.flush()
+            self._console.clear()
+        if self._jsonl:
+            self.jsonl_fp.writelines(self._jsonl)
+            self._jsonl.clear()
+
+def _load_metadata_index(
+    course_root: Path,
+) -> tuple[Dict[Path, Dict[str, Any]], Dict[str, Any]]:
     """
     Load a metadata index mapping resolved file paths to their JSON metadata.
 
@@ -359,12 +533,17 @@ def _load_metadata_index(course_root: Path) -> Dict[Path, Dict[str, Any]]:
       - A single list file (e.g. items.json: [ {...}, {...}, ... ])
       - Per-item JSON files (each is a dict with raw_file_path)
       - Container dicts with an "items" list of objects
+
+    Also returns the parsed JSON files keyed by their path relative to
+    course_root. Index entries are the same objects, so annotating an entry
+    and re-writing its file never needs a second parse.
     """
     metadata_root = course_root / "json_output"
     if not metadata_root.exists():
-        return {}
+        return {}, {}
 
     index: Dict[Path, Dict[str, Any]] = {}
+    json_docs: Dict[str, Any] = {}
 
     for json_path in metadata_root.rglob("*.json"):
         try:
@@ -379,43 +558,19 @@ def _load_metadata_index(course_root: Path) -> Dict[Path, Dict[str, Any]]:
             rel_json_path = json_path.relative_to(course_root)
         except ValueError:
             rel_json_path = json_path
+        rel_json_str = str(rel_json_path)
+        json_docs[rel_json_str] = data
 
-        # Case 1: top-level list of items
-        if isinstance(data, list):
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-                raw_file_path = item.get("raw_file_path")
-                if not raw_file_path:
-                    continue
-                path = (course_root / raw_file_path).resolve()
-                # annotate with the JSON file that defined this item
-                item["_json_path"] = str(rel_json_path)
-                index[path] = item
-
-        # Case 2: top-level dict
-        elif isinstance(data, dict):
-            # 2a: single item dict with raw_file_path
-            raw_file_path = data.get("raw_file_path")
-            if raw_file_path:
-                path = (course_root / raw_file_path).resolve()
-                data["_json_path"] = str(rel_json_path)
-                index[path] = data
-
-            # 2b: container with an "items" list
-            items = data.get("items")
-            if isinstance(items, list):
-                for item in items:
-                    if not isinstance(item, dict):
-                        continue
-                    raw_file_path = item.get("raw_file_path")
-                    if not raw_file_path:
-                        continue
-                    path = (course_root / raw_file_path).resolve()
-                    item["_json_path"] = str(rel_json_path)
-                    index[path] = item
+        for item in _iter_json_items(data):
+            raw_file_path = item.get("raw_file_path")
+            if not raw_file_path:
+                continue
+            path = (course_root / raw_file_path).resolve()
+            # annotate with the JSON file that defined this item
+            item["_json_path"] = rel_json_str
+            index[path] = item
 
-    return index
+    return index, json_docs
 def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
     course_root = Path(args.course_root).resolve()
     summary_path = Path(args.summary_json).resolve()
@@ -431,7 +586,7 @@ def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
 
     include_dirnames = _csv_to_set(getattr(args, "include_dirnames", None))
 
-    exclusion_set: set[Path] = set()
+    exclusion_set: set[str] = set()
     if args.exclude_csv:
         exclusion_set = _read_exclusion_csv(course_root, Path(args.exclude_csv))
         print(f"[filterer] Loaded {len(exclusion_set)} exclusion paths from CSV")
@@ -462,6 +617,7 @@ def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
         log_path = Path(args.log_removed_to).resolve()
         log_path.parent.mkdir(parents=True, exist_ok=True)
         jsonl_fp = log_path.open("w", encoding="utf-8")
+    removal_log = _RemovalLog(log_removed=log_removed, jsonl_fp=jsonl_fp)
 
     all_files = _discover_files_under(
         course_root,
@@ -470,15 +626,16 @@ def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
     )
 
     # load metadata index
-    metadata_index = _load_metadata_index(course_root)
+    metadata_index, json_docs = _load_metadata_index(course_root)
+    # JSON files annotated in dry-run mode (relative path -> parsed data).
+    # Each is written once when the run finishes, even if it fails midway.
+    dirty_json: Dict[str, Any] = {}
 
     total_considered = 0
-    removed_csv = 0
-    removed_dupe = 0
-    removed_small = 0
-    removed_title_blacklist = 0
-    removed_large = 0 
-    removed_suffix = 0
+    removed_counts: Dict[str, int] = {
+        reason: 0
+        for reason in ("suffix", "csv", "title_blacklist", "dupe", "small", "large")
+    }
 
     # Track removals for summary (optional)
     removed_files: list[Dict[str, Any]] = []
@@ -497,249 +654,161 @@ def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
         if max_removed_in_summary > 0 and len(removed_files) < max_removed_in_summary:
             removed_files.append(event)
 
+    def rel_to_course(p: Path) -> str:
+        return str(p.relative_to(course_root)) if p.is_relative_to(course_root) else str(p)
+
     seen_hashes: dict[str, Path] = {}
 
+    # --- Filter stages ---
+    # Each stage returns (reason, extra event fields) when the file should be
+    # removed, else None. Stages run in order and the first hit wins.
+
+    def suffix_stage(p: Path, probe: _FileProbe, meta: Optional[Dict[str, Any]]) -> Optional[_StageHit]:
+        suffix = p.suffix.lower()
+        if suffix in exclude_suffixes:
+            return "suffix", {"suffix": suffix}
+        return None
+
+    # 1) Explicit CSV exclusion
+    def csv_stage(p: Path, probe: _FileProbe, meta: Optional[Dict[str, Any]]) -> Optional[_StageHit]:
+        if str(p) in exclusion_set:
+            return "csv", {}
+        return None
+
+    # 2) title / metadata blacklist (whole-word/phrase, TITLE ONLY)
+    def title_stage(p: Path, probe: _FileProbe, meta: Optional[Dict[str, Any]]) -> Optional[_StageHit]:
+        if not meta:
+            return None
+        title = meta.get("title")
+        if not isinstance(title, str) or not title:
+            return None
+        title_text = title.lower()
+        for term, pattern in title_blacklist_patterns.items():
+            if pattern.search(title_text):
+                return "title_blacklist", {"blacklisted_term": term}
+        return None
+
+    # 3) Duplicate removal (first file seen with a given hash is kept)
+    def dupe_stage(p: Path, probe: _FileProbe, meta: Optional[Dict[str, Any]]) -> Optional[_StageHit]:
+        h = probe.sha256
+        if h is None:
+            return None
+        dupe_of = seen_hashes.get(h)
+        if dupe_of is None:
+            seen_hashes[h] = p
+            return None
+        return "dupe", {"dupe_of": rel_to_course(dupe_of)}
+
+    # 4) Token-count-based removal (only text-like files)
+    def token_stage(p: Path, probe: _FileProbe, meta: Optional[Dict[str, Any]]) -> Optional[_StageHit]:
+        tok_count = probe.token_count
+        if min_tokens is not None and tok_count is not None and tok_count < min_tokens:
+            return "small", {"token_count": tok_count, "suffix": p.suffix.lower()}
+        if max_tokens is not None and tok_count is not None and tok_count > max_tokens:
+            return "large", {"token_count": tok_count, "suffix": p.suffix.lower()}
+        return None
+
+    # Only enabled filters are added, so the per-file loop never re-checks
+    # configuration for filters that are switched off.
+    stages: list[Callable[[Path, _FileProbe, Optional[Dict[str, Any]]], Optional[_StageHit]]] = []
+    if exclude_suffixes:
+        stages.append(suffix_stage)
+    if exclusion_set:
+        stages.append(csv_stage)
+    if title_blacklist_patterns:
+        stages.append(title_stage)
+    if dedupe_enabled:
+        stages.append(dupe_stage)
+    if min_tokens is not None or max_tokens is not None:
+        stages.append(token_stage)
+
+    def probe_file(p: Path) -> _FileProbe:
+        # Suffix / CSV removals are decided without touching file contents
+        if (exclude_suffixes and p.suffix.lower() in exclude_suffixes) or str(p) in exclusion_set:
+            return _FileProbe()
+        return _probe_file(
+            p,
+            want_hash=dedupe_enabled,
+            min_tokens=min_tokens,
+            max_tokens=max_tokens,
+        )
+
+    # File reads and hashing release the GIL, so they run on a thread pool.
+    # Results come back in discovery order and every decision (dedupe
+    # "first seen wins", deletions, logging) stays on this thread.
+    workers = max(1, int(getattr(args, "workers", 1) or 1))
+    executor: Optional[ThreadPoolExecutor] = None
+    if workers > 1 and len(all_files) > 1:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        probes: Iterable[_FileProbe] = executor.map(probe_file, all_files)
+    else:
+        probes = map(probe_file, all_files)
+
+    action = "would_remove" if dry_run else "removed"
+
     try:
-        for p in all_files:
+        for p, probe in zip(all_files, probes):
             total_considered += 1
 
-            action = "would_remove" if dry_run else "removed"
-            rel_str = str(p.relative_to(course_root)) if p.is_relative_to(course_root) else str(p)
-
             # look up metadata & associated JSON file once
-            meta = metadata_index.get(p.resolve())
+            meta = metadata_index.get(p)
+
+            hit: Optional[_StageHit] = None
+            for stage in stages:
+                hit = stage(p, probe, meta)
+                if hit is not None:
+                    break
+            if hit is None:
+                continue
+
+            reason, extra = hit
+            removed_counts[reason] += 1
+
             json_rel_str: Optional[str] = None
             if meta is not None:
                 jp = meta.get("_json_path")
                 if isinstance(jp, str):
                     json_rel_str = jp
 
-            def delete_sidecar_json() -> None:
-                if json_rel_str is None or dry_run:
-                    return
-                json_path = (course_root / json_rel_str).resolve()
-                json_path.unlink(missing_ok=True)
-
-
-            if exclude_suffixes and p.suffix.lower() in exclude_suffixes:
-                removed_suffix += 1
-                event: Dict[str, Any] = {
-                    "action": action,
-                    "reason": "suffix",
-                    "path": rel_str,
-                    "suffix": p.suffix.lower(),
-                }
-                if json_rel_str is not None:
-                    event["json_path"] = json_rel_str
-
-                if dry_run and json_rel_str is not None and meta is not None:
-                    _annotate_json_removal(
-                        course_root=course_root,
-                        json_rel_str=json_rel_str,
-                        meta=meta,
-                        event=event,
-                    )
-
-                _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                maybe_record(event)
-                if not dry_run:
-                    p.unlink(missing_ok=True)
-                    delete_sidecar_json()
-                continue
-
-            # 1) Explicit CSV exclusion
-            if p in exclusion_set:
-                removed_csv += 1
-                event: Dict[str, Any] = {
-                    "action": action,
-                    "reason": "csv",
-                    "path": rel_str,
-                }
+            event: Dict[str, Any] = {
+                "action": action,
+                "reason": reason,
+                "path": rel_to_course(p),
+                **extra,
+            }
+            if json_rel_str is not None:
+                event["json_path"] = json_rel_str
+
+            # Sidecar annotation only matters in dry-run mode; real runs delete
+            # the sidecar, so writing it first would be wasted I/O.
+            if dry_run:
+                if json_rel_str is not None and meta is not None:
+                    _annotate_json_removal(data=json_docs[json_rel_str], meta=meta, event=event)
+                    dirty_json[json_rel_str] = json_docs[json_rel_str]
+            else:
+                p.unlink(missing_ok=True)
                 if json_rel_str is not None:
-                    event["json_path"] = json_rel_str
-
-                # New: annotate JSON in dry-run
-                if dry_run and json_rel_str is not None and meta is not None:
-                    _annotate_json_removal(
-                        course_root=course_root,
-                        json_rel_str=json_rel_str,
-                        meta=meta,
-                        event=event,
-                    )
-
-                _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                maybe_record(event)
-                if not dry_run:
-                    p.unlink(missing_ok=True)
-                    delete_sidecar_json()
-                continue
-
+                    (course_root / json_rel_str).resolve().unlink(missing_ok=True)
 
-               # 2) title / metadata blacklist (whole-word/phrase, TITLE ONLY)
-            if title_blacklist_patterns:
-                # meta & json_rel_str are computed earlier in the loop:
-                # meta = metadata_index.get(p.resolve())
-                # json_rel_str = meta.get("_json_path") if meta else None
-
-                title_text: Optional[str] = None
-                if meta:
-                    val = meta.get("title")
-                    if isinstance(val, str):
-                        title_text = val.lower()
-
-                bad_term = None
-                if title_text:
-                    for term, pattern in title_blacklist_patterns.items():
-                        if pattern.search(title_text):
-                            bad_term = term
-                            break
-
-                if bad_term is not None:
-                    removed_title_blacklist += 1
-                    event: Dict[str, Any] = {
-                        "action": action,
-                        "reason": "title_blacklist",
-                        "path": rel_str,
-                        "blacklisted_term": bad_term,
-                    }
-                    if json_rel_str is not None:
-                        event["json_path"] = json_rel_str
-
-                    if dry_run and json_rel_str is not None and meta is not None:
-                        _annotate_json_removal(
-                            course_root=course_root,
-                            json_rel_str=json_rel_str,
-                            meta=meta,
-                            event=event,
-                        )
-
-                    _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                    maybe_record(event)
-                    if not dry_run:
-                        p.unlink(missing_ok=True)
-                        delete_sidecar_json()
-                    continue
-
-
-
-            # 3) Duplicate removal
-            if dedupe_enabled:
-                try:
-                    data = p.read_bytes()
-                except OSError:
-                    data = None
-
-                if data is not None:
-                    h = hashlib.sha256(data).hexdigest()
-                    if h in seen_hashes:
-                        removed_dupe += 1
-                        dupe_of = seen_hashes[h]
-                        dupe_of_rel = (
-                            str(dupe_of.relative_to(course_root))
-                            if dupe_of.is_relative_to(course_root)
-                            else str(dupe_of)
-                        )
-                        event = {
-                            "action": action,
-                            "reason": "dupe",
-                            "path": rel_str,
-                            "dupe_of": dupe_of_rel,
-                        }
-                        if json_rel_str is not None:
-                            event["json_path"] = json_rel_str
-
-                        if dry_run and json_rel_str is not None and meta is not None:
-                            _annotate_json_removal(
-                                course_root=course_root,
-                                json_rel_str=json_rel_str,
-                                meta=meta,
-                                event=event,
-                            )
-                        _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                        maybe_record(event)
-                        if not dry_run:
-                            p.unlink(missing_ok=True)
-                            delete_sidecar_json()
-                        continue
-                    else:
-                        seen_hashes[h] = p
-
-            # 4) Token-count-based removal (only text-like files)
-            if (min_tokens is not None or max_tokens is not None) and p.suffix.lower() in _TEXT_SUFFIXES:
-                try:
-                    text = p.read_text(encoding="utf-8", errors="ignore")
-                except OSError:
-                    text = ""
-
-                tok_count = _estimate_token_count(text)
-
-                # First: drop if too small
-                if min_tokens is not None and tok_count < min_tokens:
-                    removed_small += 1
-                    event = {
-                        "action": action,
-                        "reason": "small",
-                        "path": rel_str,
-                        "token_count": tok_count,
-                        "suffix": p.suffix.lower(),
-                    }
-                    if json_rel_str is not None:
-                        event["json_path"] = json_rel_str
-
-                    if dry_run and json_rel_str is not None and meta is not None:
-                        _annotate_json_removal(
-                            course_root=course_root,
-                            json_rel_str=json_rel_str,
-                            meta=meta,
-                            event=event,
-                        )
-
-                    _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                    maybe_record(event)
-                    if not dry_run:
-                        p.unlink(missing_ok=True)
-                        delete_sidecar_json()
-                    continue
-
-                # Second: drop if too large
-                if max_tokens is not None and tok_count > max_tokens:
-                    removed_large += 1
-                    event = {
-                        "action": action,
-                        "reason": "large",
-                        "path": rel_str,
-                        "token_count": tok_count,
-                        "suffix": p.suffix.lower(),
-                    }
-                    if json_rel_str is not None:
-                        event["json_path"] = json_rel_str
-
-                    if dry_run and json_rel_str is not None and meta is not None:
-                        _annotate_json_removal(
-                            course_root=course_root,
-                            json_rel_str=json_rel_str,
-                            meta=meta,
-                            event=event,
-                        )
-
-                    _log_event(event=event, log_removed=log_removed, jsonl_fp=jsonl_fp)
-                    maybe_record(event)
-                    if not dry_run:
-                        p.unlink(missing_ok=True)
-                        delete_sidecar_json()
-                    continue
+            removal_log.add(event)
+            maybe_record(event)
     finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if dirty_json:
+            _write_json_docs(course_root, dirty_json)
+        removal_log.flush()
         if jsonl_fp is not None:
             jsonl_fp.close()
 
     summary: Dict[str, Any] = {
         "course_root": str(course_root),
         "total_considered": total_considered,
-        "removed_csv": removed_csv,
-        "removed_dupe": removed_dupe,
-        "removed_small": removed_small,
-        "removed_title_blacklist": removed_title_blacklist,
-        "removed_suffix": removed_suffix,
+        "removed_csv": removed_counts["csv"],
+        "removed_dupe": removed_counts["dupe"],
+        "removed_small": removed_counts["small"],
+        "removed_title_blacklist": removed_counts["title_blacklist"],
+        "removed_suffix": removed_counts["suffix"],
         "dry_run": dry_run,
         "min_token_count": min_tokens,
         "max_token_count": max_tokens,
@@ -764,9 +833,9 @@ def run_filtering(args: argparse.Namespace) -> Dict[str, Any]:
 
     print(
         f"[filterer] Summary: considered={total_considered}, "
-        f"csv={removed_csv}, title_blacklist={removed_title_blacklist}, "
-        f"dupes={removed_dupe}, small={removed_small}, large={removed_large}, "
-        f"suffix={removed_suffix}, dry_run={dry_run}"
+        f"csv={removed_counts['csv']}, title_blacklist={removed_counts['title_blacklist']}, "
+        f"dupes={removed_counts['dupe']}, small={removed_counts['small']}, "
+        f"large={removed_counts['large']}, suffix={removed_counts['suffix']}, dry_run={dry_run}"
     )
 
     return summary
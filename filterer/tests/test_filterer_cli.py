@@ -0,0 +1,283 @@
+import csv
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from filterer import cli
+
+
+# --- Reference implementations from before the rewrite ---
+
+def _old_token_count(text: str) -> int:
+    return len(re.findall(r"\S+", text))
+
+
+def _old_read_exclusion_csv(course_root: Path, csv_path: Path) -> set[Path]:
+    with csv_path.resolve().open("r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = [fn.strip() for fn in (reader.fieldnames or [])]
+
+        path_key: Optional[str] = None
+        for candidate in ("raw_file_path", "file_path", "path"):
+            if candidate in fieldnames:
+                path_key = candidate
+                break
+
+        if path_key is None:
+            f.seek(0)
+            first_line = next(f).strip()
+            if not first_line:
+                return set()
+            headers = [h.strip() for h in first_line.split(",") if h.strip()]
+            if not headers:
+                return set()
+            path_key = headers[0]
+            f.seek(0)
+            reader = csv.DictReader(f)
+
+        rel_paths: set[Path] = set()
+        for row in reader:
+            raw_val = (row.get(path_key) or "").strip()
+            if raw_val:
+                rel_paths.add(Path(raw_val))
+
+    return {(course_root / p).resolve() for p in rel_paths}
+
+
+# --- Token counting ---
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "   ",
+        "one",
+        "  leading and trailing  ",
+        "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds",
+        "ascii separators\x1cfile\x1dgroup\x1erecord\x1funit",
+        "<p>Hello,&nbsp;world!</p>\n<div class='x'>   </div>",
+        "café naïve résumé",
+        "no-break space and em space　ideographic",
+        "next\u0085line  line para",
+        "日本語 の テキスト",
+        "emoji \U0001F600\U0001F600 and ​zero-width",
+    ],
+)
+def test_token_count_matches_regex_split(text):
+    assert cli._estimate_token_count(text.encode("utf-8")) == _old_token_count(text)
+
+
+def test_token_count_ignores_invalid_utf8_like_read_text():
+    data = b"abc \xff\xfe def\xc3"
+    assert cli._estimate_token_count(data) == _old_token_count(data.decode("utf-8", errors="ignore"))
+
+
+# --- Dupe detection ---
+
+def _run(course_root: Path, tmp_path: Path, *extra: str) -> dict:
+    summary = tmp_path / "summary.json"
+    assert cli.main(["--course-root", str(course_root), "--summary-json", str(summary), *extra]) == 0
+    return json.loads(summary.read_text())
+
+
+@pytest.mark.parametrize("workers", ["1", "4"])
+def test_dupes_small_and_mmap_sized_files(tmp_path, workers):
+    course = tmp_path / "course"
+    (course / "files").mkdir(parents=True)
+    big = bytes(range(256)) * (cli._MMAP_HASH_THRESHOLD // 256 + 17)
+    (course / "files" / "a_big.bin").write_bytes(big)
+    (course / "files" / "b_big.bin").write_bytes(big)
+    (course / "files" / "c_big.bin").write_bytes(big[:-1] + b"x")
+    (course / "files" / "d_small.txt").write_text("same words")
+    (course / "files" / "e_small.txt").write_text("same words")
+    (course / "files" / "f_small.txt").write_text("other words")
+
+    summary = _run(course, tmp_path, "--dry-run", "--workers", workers, "--max-removed-in-summary", "10")
+
+    # First file in discovery (rglob) order wins, as before
+    order = [p.relative_to(course).as_posix() for p in course.rglob("*") if p.is_file()]
+    expected = {}
+    for group in (["files/a_big.bin", "files/b_big.bin"], ["files/d_small.txt", "files/e_small.txt"]):
+        keep, drop = sorted(group, key=order.index)
+        expected[drop] = keep
+
+    assert summary["removed_dupe"] == 2
+    assert {e["path"]: e["dupe_of"] for e in summary["removed_files"]} == expected
+
+
+def test_mmap_hash_matches_sha256(tmp_path):
+    p = tmp_path / "big.bin"
+    data = b"\x00\x01" * (cli._MMAP_HASH_THRESHOLD // 2 + 5)
+    p.write_bytes(data)
+
+    probe = cli._probe_file(p, want_hash=True, min_tokens=None, max_tokens=None)
+    assert probe.sha256 == hashlib.sha256(data).hexdigest()
+
+
+# --- Exclusion CSV ---
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "raw_file_path,title\npages/a.html,A\nfiles/b c.pdf,B\n",
+        "title,file_path\n\"Quoted, title\",\"files/with, comma.pdf\"\nX,\"pages/\"\"q\"\".html\"\n",
+        "﻿raw_file_path,title\npages/a.html,A\n",
+        "﻿title,raw_file_path\nA,pages/a.html\n",
+        "path\r\n  pages/padded.html  \r\n\r\n,\r\npages/a.html\r\n",
+        "name,other\nfiles/first_col.pdf,x\n",
+        "title\n",
+    ],
+)
+def test_exclusion_csv_matches_dictreader(tmp_path, content):
+    course = tmp_path / "course"
+    course.mkdir()
+    csv_path = tmp_path / "exclude.csv"
+    csv_path.write_bytes(content.encode("utf-8"))
+
+    expected = {str(p) for p in _old_read_exclusion_csv(course, csv_path)}
+    assert cli._read_exclusion_csv(course, csv_path) == expected
+
+
+# --- Dry-run sidecar annotation ---
+
+def _annotated_course(tmp_path: Path) -> Path:
+    course = tmp_path / "course"
+    (course / "pages").mkdir(parents=True)
+    (course / "json_output").mkdir()
+    for name in ("a", "b", "c", "d"):
+        (course / "pages" / f"{name}.html").write_text(f"page {name}")
+    items = [
+        {"title": "Midterm A", "raw_file_path": "pages/a.html"},
+        {"title": "Exam B", "raw_file_path": "pages/b.html"},
+        {"title": "Notes D", "raw_file_path": "pages/d.html"},
+    ]
+    (course / "json_output" / "items.json").write_text(json.dumps(items))
+    (course / "json_output" / "page_c.json").write_text(
+        json.dumps({"title": "Solution C", "raw_file_path": "pages/c.html"})
+    )
+    return course
+
+
+@pytest.fixture
+def json_writes(monkeypatch):
+    writes = []
+    real = Path.write_bytes
+
+    def recording(self, data):
+        if self.suffix == ".json" and self.parent.name == "json_output":
+            writes.append(self.name)
+        return real(self, data)
+
+    monkeypatch.setattr(Path, "write_bytes", recording)
+    return writes
+
+
+def test_dry_run_writes_each_sidecar_once(tmp_path, json_writes):
+    course = _annotated_course(tmp_path)
+    _run(course, tmp_path, "--dry-run")
+
+    assert sorted(json_writes) == ["items.json", "page_c.json"]
+    items = json.loads((course / "json_output" / "items.json").read_text())
+    assert [i.get("removed") for i in items] == [True, True, None]
+    assert items[0]["removal_reason"] == "title_blacklist"
+    single = json.loads((course / "json_output" / "page_c.json").read_text())
+    assert single["removed"] is True
+    assert not any("_json_path" in i for i in [*items, single])
+    # Dry run: the files themselves stay
+    assert len(list((course / "pages").iterdir())) == 4
+
+
+def test_dry_run_writes_annotations_when_loop_raises(tmp_path, monkeypatch, json_writes):
+    course = _annotated_course(tmp_path)
+    calls = []
+    real_add = cli._RemovalLog.add
+
+    def failing_add(self, event):
+        calls.append(event["path"])
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return real_add(self, event)
+
+    monkeypatch.setattr(cli._RemovalLog, "add", failing_add)
+    with pytest.raises(RuntimeError):
+        _run(course, tmp_path, "--dry-run")
+
+    # Both removals that were annotated before the error are on disk, once each
+    annotated = {
+        "json_output/items.json" if p in ("pages/a.html", "pages/b.html") else "json_output/page_c.json"
+        for p in calls
+    }
+    assert sorted(json_writes) == sorted(Path(a).name for a in annotated)
+    for rel in annotated:
+        data = json.loads((course / rel).read_text())
+        docs = data if isinstance(data, list) else [data]
+        assert any(d.get("removed") for d in docs)
+        assert not any("_json_path" in d for d in docs)
+
+
+# --- Discovery ---
+
+def _old_discover_files_under(root: Path, *, skip_dirnames, include_dirnames=None) -> list[Path]:
+    files = []
+    for p in root.rglob("*"):
+        if not p.is_file():
+            continue
+        rel = p.relative_to(root)
+        if any(part in skip_dirnames for part in rel.parts):
+            continue
+        if len(rel.parts) == 1:
+            files.append(p.resolve())
+            continue
+        if include_dirnames is not None and rel.parts[0] not in include_dirnames:
+            continue
+        files.append(p.resolve())
+    return files
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "course"
+    for rel in (
+        "top.html",
+        "locked",
+        "pages/a.html",
+        "pages/nested/deeper/b.html",
+        "pages/json_output/skipped.json",
+        "pages/locked/x.pdf",
+        "files/c.pdf",
+        "files/a.b/d.pdf",
+        "files/axb/e.pdf",
+        "x+y/f.txt",
+        "xxy/g.txt",
+        "json_output/page_1.json",
+        "assignments/h.html",
+        "assignments/pages/i.html",
+        "empty_dir/",
+    ):
+        p = root / rel
+        if rel.endswith("/"):
+            p.mkdir(parents=True, exist_ok=True)
+            continue
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(rel)
+    return root
+
+
+@pytest.mark.parametrize(
+    "skip, include",
+    [
+        ({"locked", "json_output"}, None),
+        ({"locked", "json_output", "nested"}, None),
+        ({"locked", "json_output", "a.b"}, {"files", "x+y"}),
+        ({"locked", "json_output"}, {"pages"}),
+        ({"locked", "json_output"}, set()),
+        (set(), None),
+    ],
+)
+def test_discovery_matches_rglob(tree, skip, include):
+    got = cli._discover_files_under(tree, skip_dirnames=skip, include_dirnames=include)
+    assert got == _old_discover_files_under(tree, skip_dirnames=skip, include_dirnames=include)
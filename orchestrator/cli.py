@@ -13,6 +13,9 @@ from orchestrator.run_pipeline import run_pipeline, _load_yaml
 
 _ALWAYS_SKIP = {"locked", "json_output"}
 
+# /courses/<id> anywhere in a URL path
+_COURSE_RE = re.compile(r"/courses/(\d+)(?:/|$)")
+
 
 def _read_env_file(path: Path) -> dict[str, str]:
     """
@@ -25,18 +28,19 @@ def _read_env_file(path: Path) -> dict[str, str]:
         raise FileNotFoundError(f".env file not found: {path}")
 
     out: dict[str, str] = {}
-    for line in path.read_text(encoding="utf-8").splitlines():
-        s = line.strip()
-        if not s or s.startswith("#"):
-            continue
-        if "=" not in s:
-            continue
-        k, v = s.split("=", 1)
-        k = k.strip()
-        v = v.strip()
-        if (v.startswith('"') and v.endswith('"')) or (v.startswith("'") and v.endswith("'")):
-            v = v[1:-1]
-        out[k] = v
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            s = raw.strip()
+            if not s or s[0] == "#":
+                continue
+            k, sep, v = s.partition("=")
+            if not sep:
+                continue
+            v = v.strip()
+            q = v[:1]
+            if q in ('"', "'") and v[-1:] == q:
+                v = v[1:-1]
+            out[k.strip()] = v
     return out
 
 
@@ -51,7 +55,7 @@ def _parse_course_url(course_url: str) -> tuple[str, int]:
         raise ValueError(f"Invalid URL: {course_url}")
 
     # Find /courses/<id> anywhere in the path
-    m = re.search(r"/courses/(\d+)(?:/|$)", u.path)
+    m = _COURSE_RE.search(u.path)
     if not m:
         raise ValueError(
             "Course URL must include '/courses/<id>'. Example: https://learn.canvas.net/courses/3376"
@@ -65,12 +69,32 @@ def _parse_course_url(course_url: str) -> tuple[str, int]:
 def _csv_set(s: Optional[str]) -> Optional[set[str]]:
     if not s:
         return None
-    parts = [p.strip() for p in s.split(",")]
-    out = {p for p in parts if p}
+    if "," not in s:
+        s = s.strip()
+        return {s} if s else None
+    out = {p for p in (x.strip() for x in s.split(",")) if p}
     return out or None
 
 
-def parse_args() -> argparse.Namespace:
+def _mode_parser() -> argparse.ArgumentParser:
+    # Just enough to spot YAML mode; errors/help are left to the full parser
+    p = argparse.ArgumentParser(add_help=False)
+    p.add_argument("--config")
+    p.add_argument("--course-url")
+    return p
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    # YAML mode only needs --config, so the full CLI-mode parser is built only
+    # when something else is on the command line (CLI mode, --help, or extra
+    # flags that still need validating).
+    known, extra = _mode_parser().parse_known_args(argv)
+    if known.config and known.course_url is None and not extra:
+        return known
+    return _cli_parser().parse_args(argv)
+
+
+def _cli_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Canvas -> Markdown -> Chunk orchestrator")
 
     mode = p.add_mutually_exclusive_group(required=True)
@@ -204,7 +228,7 @@ def parse_args() -> argparse.Namespace:
         help="Disable duplicate removal during filtering.",
     )
 
-    return p.parse_args()
+    return p
 
 
 def build_cfg_from_cli(args: argparse.Namespace, repo_root: Path) -> dict[str, Any]:
@@ -309,8 +333,8 @@ def build_cfg_from_cli(args: argparse.Namespace, repo_root: Path) -> dict[str, A
     }
 
     # Inject secrets into env for subprocesses (crawler/conversion/chunker).
-    # NOTE: Your orchestrator currently uses os.environ.copy() inside each stage,
-    # so setting these in os.environ here is the easiest way to pass them.
+    # Stages inherit os.environ as-is (_run passes env=None), so anything a
+    # stage needs must be set here, before run_pipeline starts them.
     import os
     os.environ["CANVAS_TOKEN"] = canvas_token
     if openai_key:
@@ -334,8 +358,9 @@ def main() -> int:
         cfg_path = Path(args.config).expanduser()
         if not cfg_path.is_absolute():
             cfg_path = (repo_root / cfg_path).resolve()
-        cfg = _load_yaml(cfg_path)
-        return run_pipeline(cfg, repo_root, cfg_path)
+        cfg_raw = cfg_path.read_bytes()
+        cfg = _load_yaml(cfg_path, cfg_raw)
+        return run_pipeline(cfg, repo_root, cfg_path, cfg_raw)
 
     # CLI mode (no YAML consideration)
     cfg = build_cfg_from_cli(args, repo_root)
@@ -1,17 +1,40 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import json
+import mmap
 import os
 import shutil
 import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 from types import SimpleNamespace
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+# Sidecars at least this large are parsed from an mmap instead of read()
+_MMAP_JSON_THRESHOLD = 16 * 1024
+
+# From this many files on, conversion inputs are streamed to the converter's
+# stdin (--inputs-from -) instead of being passed on argv
+_STREAM_INPUTS_MIN_FILES = 64
+
 
 @dataclass
 class RunContext:
@@ -23,59 +46,148 @@ class RunContext:
     json_output_dir: Path      # runs/<master>/canvas/<course_id>/json_output
 
 
-def _run(cmd: list[str], cwd: Path, env: dict[str, str] | None = None) -> None:
+def _run(cmd: list[str], cwd: Path) -> None:
+    """
+    Run a stage command, raising on a non-zero exit.
+
+    Children inherit os.environ as-is (env=None); stage settings go on argv.
+    Set any environment a stage needs in os.environ before calling this.
+    """
     print("\n$", " ".join(cmd))
-    subprocess.run(cmd, cwd=str(cwd), env=env, check=True)
+    subprocess.run(cmd, cwd=str(cwd), check=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_python() -> str:
+    return shutil.which("python") or shutil.which("python3") or "python"
 
 
 def _resolve_python(cfg_section: dict[str, Any] | None, repo_root: Path) -> str:
     if cfg_section and cfg_section.get("python"):
         return str(cfg_section["python"])
+    return _probe_python(os.environ.get("VENV_PY"), str(repo_root))
 
-    env_py = os.environ.get("VENV_PY")
-    if env_py and Path(env_py).is_file():
+
+@functools.lru_cache(maxsize=None)
+def _probe_python(env_py: str | None, repo_root: str) -> str:
+    # Cached so every stage shares one round of is_file()/PATH probing
+    if env_py and os.path.isfile(env_py):
         return env_py
 
-    venv_py = repo_root / ".venv" / "bin" / "python"
-    if venv_py.is_file():
-        return str(venv_py)
+    venv_py = os.path.join(repo_root, ".venv", "bin", "python")
+    if os.path.isfile(venv_py):
+        return venv_py
+
+    return _default_python()
+
+
+@functools.lru_cache(maxsize=1)
+def _warn_pure_python_yaml() -> None:
+    print(
+        "[warn] PyYAML has no libyaml bindings; using the slower pure-Python loader. "
+        "Install libyaml (e.g. libyaml-dev) and reinstall PyYAML to enable CSafeLoader.",
+        file=sys.stderr,
+    )
+
+
+def _load_yaml(path: Path, raw: bytes | None = None) -> dict[str, Any]:
+    """
+    Parse a YAML file. Pass raw when the caller already holds the file contents.
+    """
+    if raw is None:
+        raw = path.read_bytes()
+    if _YamlLoader is yaml.SafeLoader:
+        _warn_pure_python_yaml()
+    # libyaml reads the UTF-8 bytes directly; no Python-side decode
+    return yaml.load(raw, Loader=_YamlLoader)
+
 
-    return shutil.which("python") or "python"
+def _load_json_bytes(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
-def _load_yaml(path: Path) -> dict[str, Any]:
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+def _load_json_file(path: Path) -> Any:
+    """
+    Parse a JSON file. Files of _MMAP_JSON_THRESHOLD bytes or more are handed to
+    orjson as a view over an mmap, which skips copying them into a bytes object.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if orjson is None or size < _MMAP_JSON_THRESHOLD:
+            return _load_json_bytes(fh.read())
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
 
 
-def _atomic_write_json(path: Path, obj: dict[str, Any]) -> None:
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp.replace(path)
+def _dump_json_bytes(obj: Any) -> bytes:
+    """
+    Serialize to indented UTF-8 JSON (orjson when installed, stdlib otherwise).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path | str, payload: bytes) -> None:
+    # Raw fd write + fsync of already-serialized bytes, rename over the target,
+    # then fsync the directory so the rename itself survives a crash
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
 
-def _compute_md_path(markdown_root: Path, raw_file_path: str) -> Path:
+@functools.lru_cache(maxsize=8192)
+def _compute_md_path(markdown_root: str, raw_file_path: str) -> str:
     # raw_file_path is like 'pages/120231.html' relative to course_root
-    rel = Path(raw_file_path)
-    return (markdown_root / rel).with_suffix(".md")
+    # String keys so repeated (root, raw) pairs hit the cache
+    return str((Path(markdown_root) / raw_file_path).with_suffix(".md"))
 
 
 def _iter_json_files(json_output_dir: Path) -> Iterable[Path]:
-    if not json_output_dir.exists():
+    try:
+        with os.scandir(json_output_dir) as it:
+            # Same matches as Path.glob("*.json"), which includes dotfiles
+            names = [e.path for e in it if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
         return []
-    return sorted(p for p in json_output_dir.glob("*.json") if p.is_file())
+    # Sort the strings, build Paths afterwards
+    names.sort()
+    return [Path(p) for p in names]
 
 
 def build_context(cfg: dict[str, Any], repo_root: Path, master_run_dir: Path) -> RunContext:
     course_id = str(cfg["canvas"]["course_id"])
 
-    course_root = (master_run_dir / "canvas" / "output" / str(course_id)).resolve()
-    processor_dir = (master_run_dir / "processor").resolve()
-    markdown_root = (processor_dir / "markdown").resolve()
-    json_output_dir = (course_root / cfg["bridge"]["json_output_dirname"]).resolve()
+    # Resolve the run dir once; everything else hangs off it
+    base = master_run_dir.resolve()
+    if not base.is_dir():
+        raise FileNotFoundError(f"master run dir does not exist: {base}")
+
+    course_root = base / "canvas" / "output" / course_id
+    processor_dir = base / "processor"
+    markdown_root = processor_dir / "markdown"
+    json_output_dir = course_root / cfg["bridge"]["json_output_dirname"]
 
     return RunContext(
         repo_root=repo_root,
-        master_run_dir=master_run_dir.resolve(),
+        master_run_dir=base,
         course_root=course_root,
         processor_dir=processor_dir,
         markdown_root=markdown_root,
@@ -117,9 +229,9 @@ def _get_enabled_steps(cfg: dict[str, Any]) -> set[str]:
     return set(parts)
 
 
-def run_crawler(cfg: dict[str, Any], repo_root: Path, master_run_dir: Path) -> None:
+def _crawler_cmd(cfg: dict[str, Any], repo_root: Path, master_run_dir: Path) -> list[str]:
     canvas = cfg["canvas"]
-    python = canvas.get("python") or shutil.which("python") or "python"
+    python = _resolve_python(canvas, repo_root)
 
     # Treat this as a *module path* for `python -m`
     # e.g. "canvas_crawler.cli" or "canvas_crawler.canvas_crawler"
@@ -144,89 +256,173 @@ def run_crawler(cfg: dict[str, Any], repo_root: Path, master_run_dir: Path) -> N
     if canvas.get("verbose", False):
         cmd.append("--verbose")
 
-    env = os.environ.copy()
-    _run(cmd, cwd=repo_root, env=env)
+    return cmd
+
+
+def run_crawler(cfg: dict[str, Any], repo_root: Path, master_run_dir: Path) -> None:
+    cmd = _crawler_cmd(cfg, repo_root, master_run_dir)
+    _run(cmd, cwd=repo_root)
+
+
+# Never worth handing to the converter
+_JUNK_FILENAMES = frozenset({".DS_Store", "Thumbs.db", "desktop.ini"})
+
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+def _prefetch(path: str) -> None:
+    """
+    Ask the kernel to start reading path into the page cache (POSIX_FADV_WILLNEED)
+    so the converter, which opens every discovered file next, finds warm pages.
+    Best effort: any failure just means no readahead hint.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOATIME", 0))
+    except PermissionError:
+        # O_NOATIME is only allowed on files we own
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _scandir_recursive(
+    root: str,
+    skip_dirnames: frozenset[str] | set[str],
+    include_dirnames: frozenset[str] | set[str] | None,
+    *,
+    allowed_suffixes: frozenset[str] | None = None,
+    min_bytes: int = 0,
+    prefetch: bool = False,
+) -> Iterator[str]:
+    """
+    Yield file paths (str) under root with an explicit-stack os.scandir walk.
 
+    Directories named in skip_dirnames are pruned before they are opened; at
+    the top level, so are directories missing from include_dirnames (when set).
+    Files directly under root are always yielded. DirEntry type checks use the
+    d_type from readdir, so regular files and dirs cost no extra stat().
 
-def _should_skip(path: Path, root: Path, skip_dirnames: set[str]) -> bool:
-    rel = path.relative_to(root)
-    return any(part in skip_dirnames for part in rel.parts)
+    Dotfiles and OS junk files are never yielded. allowed_suffixes (lowercase,
+    no dot) limits files by extension; min_bytes > 0 drops smaller files.
+    With prefetch, each yielded file gets a readahead hint (see _prefetch).
+    """
+    if not os.path.isdir(root):
+        # A missing root is just an empty walk; callers report "no files"
+        return
+    prefetch = prefetch and _HAS_FADVISE
+    stack: list[tuple[str, int]] = [(root, 0)]
+    while stack:
+        d, depth = stack.pop()
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if e.name in skip_dirnames:
+                        continue
+                    if depth == 0 and include_dirnames is not None and e.name not in include_dirnames:
+                        continue
+                    stack.append((e.path, depth + 1))
+                elif e.is_file():
+                    name = e.name
+                    if name[0] == "." or name in _JUNK_FILENAMES:
+                        continue
+                    if allowed_suffixes is not None:
+                        _, dot, ext = name.rpartition(".")
+                        if not dot or ext.lower() not in allowed_suffixes:
+                            continue
+                    if min_bytes and e.stat().st_size < min_bytes:
+                        continue
+                    if prefetch:
+                        _prefetch(e.path)
+                    yield e.path
 
 
 def _discover_files_under(
     root: Path,
     *,
-    skip_dirnames: set[str],
-    include_dirnames: set[str] | None = None,
-) -> list[Path]:
+    skip_dirnames: frozenset[str] | set[str],
+    include_dirnames: frozenset[str] | set[str] | None = None,
+    allowed_suffixes: frozenset[str] | None = None,
+    min_bytes: int = 0,
+    prefetch: bool = False,
+) -> Iterator[str]:
     """
     Recursively discover files under root, excluding any files that live inside
     directories named in skip_dirnames.
 
     If include_dirnames is provided, only include files whose *top-level* folder
     (relative to root) is in include_dirnames. Root-level files (no parent dir)
-    are always included.
+    are always included. See _scandir_recursive for the per-file filters.
+
+    Lazily yields absolute path strings as the walk finds them.
     """
-    files: list[Path] = []
-    for p in root.rglob("*"):
-        if not p.is_file():
-            continue
-        if _should_skip(p, root, skip_dirnames):
-            continue
+    # abspath is pure string work; callers pass paths built from the resolved run dir
+    return _scandir_recursive(
+        os.path.abspath(root),
+        skip_dirnames,
+        include_dirnames,
+        allowed_suffixes=allowed_suffixes,
+        min_bytes=min_bytes,
+        prefetch=prefetch,
+    )
 
-        rel = p.relative_to(root)
 
-        # Root-level files are included by default
-        if len(rel.parts) == 1:
-            files.append(p.resolve())
-            continue
+def _conversion_file_filters(conv: dict[str, Any]) -> tuple[frozenset[str] | None, int]:
+    """
+    Return (allowed_suffixes, min_bytes) from conversion.allowed_suffixes /
+    conversion.min_bytes. No suffix list means every extension is allowed.
+    """
+    allowed_suffixes: frozenset[str] | None = None
+    raw_suffixes = conv.get("allowed_suffixes")
+    if raw_suffixes:
+        if isinstance(raw_suffixes, str):
+            raw_suffixes = raw_suffixes.split(",")
+        allowed_suffixes = frozenset(
+            str(x).strip().lstrip(".").lower() for x in raw_suffixes if str(x).strip()
+        )
+    return allowed_suffixes, int(conv.get("min_bytes", 0) or 0)
 
-        top = rel.parts[0]
-        if include_dirnames is not None:
-            if top not in include_dirnames:
-                continue
 
-        files.append(p.resolve())
+def _conversion_dir_filters(conv: dict[str, Any]) -> tuple[frozenset[str], frozenset[str] | None]:
+    """
+    Return (skip_dirnames, include_dirnames) for conversion input discovery,
+    built once as frozensets for the per-directory name checks in the walk.
+    """
+    # Always skip these
+    skip = frozenset(conv.get("skip_dirnames", [])) | {"locked", "json_output"}
+
+    # Optional include list
+    include_dirnames: frozenset[str] | None = None
+    raw_include = conv.get("include_dirnames")
+    if raw_include:
+        include_dirnames = frozenset(str(x).strip() for x in raw_include if str(x).strip())
+        # never allow these even if user includes them
+        include_dirnames -= {"locked", "json_output"}
+
+    return skip, include_dirnames
 
-    return files
 
-def run_conversion(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -> None:
+def _conversion_cmd(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -> list[str]:
+    """Conversion command line without any input paths."""
     conv = cfg["conversion"]
-    python = conv.get("python") or shutil.which("python") or "python"
+    python = _resolve_python(conv, repo_root)
 
     # Treat this as either a module path or a relative script path.
     # Default: module path for installed package usage.
     conv_target = conv.get("script") or "pre_processer.run_conversion"
 
-    ctx.processor_dir.mkdir(parents=True, exist_ok=True)
-
     # Mirror relative to course root so markdown becomes markdown/pages/..., etc.
     source_root = ctx.course_root
 
-    # Always skip these
-    skip = set(conv.get("skip_dirnames", [])) | {"locked", "json_output"}
-
-    # Optional include list
-    include_dirnames: set[str] | None = None
-    raw_include = conv.get("include_dirnames")
-    if raw_include:
-        include_dirnames = {str(x).strip() for x in raw_include if str(x).strip()}
-        # never allow these even if user includes them
-        include_dirnames -= {"locked", "json_output"}
-
-    input_files = _discover_files_under(
-        ctx.course_root,
-        skip_dirnames=skip,
-        include_dirnames=include_dirnames,
-    )
-
-    if not input_files:
-        msg = f"No files discovered under {ctx.course_root} after skipping {sorted(skip)}"
-        if include_dirnames is not None:
-            msg += f" and including only {sorted(include_dirnames)}"
-        print(msg)
-        return
-
     # Decide whether this is a module or a path
     is_module_like = (
         "/" not in conv_target
@@ -259,58 +455,330 @@ def run_conversion(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -> Non
         cmd.append("--no-llm")
     if conv.get("model"):
         cmd += ["--model", str(conv["model"])]
+    if conv.get("workers") is not None:
+        cmd += ["--workers", str(int(conv["workers"]))]
+    if conv.get("cache_dir"):
+        cache_dir = Path(conv["cache_dir"])
+        cmd += ["--cache-dir", str(cache_dir if cache_dir.is_absolute() else repo_root / cache_dir)]
+
+    return cmd
+
+
+def run_conversion(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -> None:
+    conv = cfg["conversion"]
+    ctx.processor_dir.mkdir(parents=True, exist_ok=True)
+
+    skip, include_dirnames = _conversion_dir_filters(conv)
+    allowed_suffixes, min_bytes = _conversion_file_filters(conv)
+    discovered = _discover_files_under(
+        ctx.course_root,
+        skip_dirnames=skip,
+        include_dirnames=include_dirnames,
+        allowed_suffixes=allowed_suffixes,
+        min_bytes=min_bytes,
+        # Warm the page cache while the walk continues; the converter reads these next
+        prefetch=bool(conv.get("prefetch", False)),
+    )
+
+    # Small courses: the whole list fits on argv. Past that, the converter is
+    # started right away and fed paths on stdin while the walk continues.
+    head = list(itertools.islice(discovered, _STREAM_INPUTS_MIN_FILES))
+
+    if not head:
+        msg = f"No files discovered under {ctx.course_root} after skipping {sorted(skip)}"
+        if include_dirnames is not None:
+            msg += f" and including only {sorted(include_dirnames)}"
+        print(msg)
+        return
+
+    cmd = _conversion_cmd(cfg, repo_root, ctx)
 
     # IMPORTANT: pass explicit file paths so conversion never tries to process directories
-    cmd += [str(p) for p in input_files]
+    if len(head) < _STREAM_INPUTS_MIN_FILES:
+        _run(cmd + head, cwd=repo_root)
+        return
 
-    env = os.environ.copy()
-    _run(cmd, cwd=repo_root, env=env)
+    cmd += ["--inputs-from", "-"]
+    print("\n$", " ".join(cmd))
+    proc = subprocess.Popen(cmd, cwd=str(repo_root), stdin=subprocess.PIPE)
+    assert proc.stdin is not None
+    try:
+        for path in itertools.chain(head, discovered):
+            proc.stdin.write(path.encode("utf-8") + b"\n")
+    except BrokenPipeError:
+        pass  # converter exited early; its exit code is checked below
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
 
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
 
-def update_metadata(cfg: dict[str, Any], ctx: RunContext) -> Tuple[int, int]:
-    bridge = cfg["bridge"]
-    raw_key = bridge["raw_key"]
-    legacy_key = bridge.get("legacy_key")
-    md_key = bridge["md_key"]
-    atomic = bool(bridge.get("atomic_write", True))
-    mode = bridge.get("md_value_mode", "relative_to_master_run")
 
-    updated = 0
-    skipped = 0
+def run_crawl_and_conversion_pipelined(
+    cfg: dict[str, Any],
+    repo_root: Path,
+    ctx: RunContext,
+    while_converting: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    Crawl and convert at the same time (run.pipelined: true).
 
-    for jf in _iter_json_files(ctx.json_output_dir):
-        data: Dict[str, Any] = json.loads(jf.read_text(encoding="utf-8"))
+    The converter is started with --inputs-from - and fed paths on stdin while
+    the crawler is still running. The course tree is polled every
+    run.pipeline_poll_seconds (default 2). The crawler writes each file under a
+    hidden .part name and renames it when complete, and the walk skips
+    dotfiles, so every file it finds is finished and is sent right away. The
+    crawler exiting is the signal that the crawl is done; a final scan then
+    sends everything left.
 
-        raw = data.get(raw_key)
-        if not raw and legacy_key and data.get(legacy_key):
-            raw = data[legacy_key]
-            data[raw_key] = raw
+    If the converter exits early, or anything here raises, the crawler is
+    terminated rather than left running.
+
+    while_converting, if given, is called on the same poll interval after the
+    crawl has finished and while the converter works through its backlog.
+    """
+    conv = cfg["conversion"]
+    poll_s = float((cfg.get("run") or {}).get("pipeline_poll_seconds", 2.0))
+    ctx.processor_dir.mkdir(parents=True, exist_ok=True)
+    skip, include_dirnames = _conversion_dir_filters(conv)
+    allowed_suffixes, min_bytes = _conversion_file_filters(conv)
+
+    crawl_cmd = _crawler_cmd(cfg, repo_root, ctx.master_run_dir)
+    conv_cmd = _conversion_cmd(cfg, repo_root, ctx) + ["--inputs-from", "-"]
+
+    print("\n$", " ".join(crawl_cmd))
+    crawler = subprocess.Popen(crawl_cmd, cwd=str(repo_root))
+    try:
+        print("\n$", " ".join(conv_cmd))
+        converter = subprocess.Popen(conv_cmd, cwd=str(repo_root), stdin=subprocess.PIPE)
+    except BaseException:
+        crawler.terminate()
+        crawler.wait()
+        raise
+    assert converter.stdin is not None
+
+    sent: set[str] = set()
+    course_root = os.path.abspath(ctx.course_root)
+    crawler_stopped = False
+
+    def _feed() -> None:
+        lines = [
+            path + "\n"
+            for path in _scandir_recursive(
+                course_root,
+                skip,
+                include_dirnames,
+                allowed_suffixes=allowed_suffixes,
+                min_bytes=min_bytes,
+            )
+            if path not in sent
+        ]
+        if lines:
+            sent.update(line[:-1] for line in lines)
+            converter.stdin.write("".join(lines).encode("utf-8"))
+            converter.stdin.flush()
+
+    try:
+        while True:
+            try:
+                crawler.wait(timeout=poll_s)
+                break
+            except subprocess.TimeoutExpired:
+                if converter.poll() is not None:
+                    break  # converter gone; the finally below stops the crawl
+                _feed()
+        if crawler.returncode == 0:
+            _feed()
+            converter.stdin.close()
+            if while_converting is not None:
+                while True:
+                    try:
+                        converter.wait(timeout=poll_s)
+                        break
+                    except subprocess.TimeoutExpired:
+                        while_converting()
+    except BrokenPipeError:
+        # Converter exited early; its exit code is reported below
+        pass
+    finally:
+        if crawler.poll() is None:
+            crawler_stopped = True
+            crawler.terminate()
+            crawler.wait()
+        try:
+            converter.stdin.close()
+        except BrokenPipeError:
+            pass
+        converter.wait()
+
+    # A crawl we stopped failed because of the converter; report that first
+    if converter.returncode and crawler_stopped:
+        raise subprocess.CalledProcessError(converter.returncode, conv_cmd)
+    if crawler.returncode:
+        raise subprocess.CalledProcessError(crawler.returncode, crawl_cmd)
+    if converter.returncode:
+        raise subprocess.CalledProcessError(converter.returncode, conv_cmd)
+    print(f"Streamed {len(sent)} file(s) to conversion.")
+
+
+@dataclass(frozen=True)
+class _MetadataJob:
+    raw_key: str
+    legacy_key: Optional[str]
+    md_key: str
+    atomic: bool
+    markdown_root: str
+    anchor_root: Optional[str]   # None for md_value_mode=absolute
+    anchor: str                  # anchor_root + os.sep
 
-        if not raw:
-            skipped += 1
-            continue
 
-        md_abs = _compute_md_path(ctx.markdown_root, raw)
+# _update_one results
+_META_UPDATED, _META_UNCHANGED, _META_SKIPPED = 0, 1, 2
 
-        if not md_abs.exists():
-            data[md_key] = None
-        else:
-            if mode == "absolute":
-                data[md_key] = str(md_abs)
-            elif mode == "relative_to_repo":
-                data[md_key] = str(md_abs.relative_to(ctx.repo_root))
-            else:
-                # relative_to_master_run (recommended)
-                data[md_key] = str(md_abs.relative_to(ctx.master_run_dir))
 
-        if atomic:
-            _atomic_write_json(jf, data)
-        else:
-            jf.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def _update_one(jf: Path, job: _MetadataJob) -> int:
+    """
+    Update one sidecar. Returns _META_SKIPPED when it has no raw path and
+    _META_UNCHANGED (without rewriting the file) when md_key already holds
+    the computed value.
+    """
+    data: Dict[str, Any] = _load_json_file(jf)
+
+    raw = data.get(job.raw_key)
+    filled_raw = False
+    if not raw and job.legacy_key and data.get(job.legacy_key):
+        raw = data[job.legacy_key]
+        data[job.raw_key] = raw
+        filled_raw = True
+
+    if not raw:
+        return _META_SKIPPED
+
+    md_abs = _compute_md_path(job.markdown_root, raw)
+
+    md_value: Optional[str]
+    if not os.path.exists(md_abs):
+        md_value = None
+    elif job.anchor_root is None:
+        md_value = md_abs
+    elif md_abs.startswith(job.anchor):
+        md_value = md_abs[len(job.anchor):]
+    else:
+        md_value = str(Path(md_abs).relative_to(job.anchor_root))
 
-        updated += 1
+    if not filled_raw and job.md_key in data and data[job.md_key] == md_value:
+        return _META_UNCHANGED
+    data[job.md_key] = md_value
+
+    payload = _dump_json_bytes(data)
+    # Drop the decoded doc before the write so only the bytes stay alive
+    del data
+    if job.atomic:
+        _atomic_write_bytes(jf, payload)
+    else:
+        jf.write_bytes(payload)
 
-    return updated, skipped
+    return _META_UPDATED
+
+
+def _metadata_job(cfg: dict[str, Any], ctx: RunContext) -> _MetadataJob:
+    bridge = cfg["bridge"]
+    mode = bridge.get("md_value_mode", "relative_to_master_run")
+
+    # Relative modes strip a fixed prefix; relative_to() is only the fallback
+    anchor_root: Optional[Path]
+    if mode == "absolute":
+        anchor_root = None
+    elif mode == "relative_to_repo":
+        anchor_root = ctx.repo_root
+    else:
+        # relative_to_master_run (recommended)
+        anchor_root = ctx.master_run_dir
+
+    # Interned so per-file data.get(key) lookups compare by identity first
+    legacy_key = bridge.get("legacy_key")
+    return _MetadataJob(
+        raw_key=sys.intern(str(bridge["raw_key"])),
+        legacy_key=sys.intern(str(legacy_key)) if legacy_key else None,
+        md_key=sys.intern(str(bridge["md_key"])),
+        atomic=bool(bridge.get("atomic_write", True)),
+        markdown_root=str(ctx.markdown_root),
+        anchor_root=str(anchor_root) if anchor_root is not None else None,
+        anchor=os.path.join(str(anchor_root), "") if anchor_root is not None else "",
+    )
+
+
+class _MetadataFollower:
+    """
+    Updates sidecars while the converter is still running (run.pipelined).
+
+    Only used once the crawler has exited, so the sidecar set is final. Each
+    poll() rewrites just the sidecars whose markdown has appeared since the
+    last poll and records them in rewritten; the update_metadata() pass
+    afterwards finds them unchanged and counts them as updated.
+    """
+
+    def __init__(self, cfg: dict[str, Any], ctx: RunContext) -> None:
+        self.job = _metadata_job(cfg, ctx)
+        self.json_output_dir = ctx.json_output_dir
+        self.pending: Optional[dict[Path, str]] = None  # sidecar -> expected markdown path
+        self.rewritten: set[Path] = set()
+
+    def _load_pending(self) -> dict[Path, str]:
+        job = self.job
+        pending: dict[Path, str] = {}
+        for jf in _iter_json_files(self.json_output_dir):
+            try:
+                data = _load_json_file(jf)
+            except ValueError:
+                continue  # left for update_metadata to report
+            raw = data.get(job.raw_key) or (job.legacy_key and data.get(job.legacy_key))
+            if raw:
+                pending[jf] = _compute_md_path(job.markdown_root, raw)
+        return pending
+
+    def poll(self) -> None:
+        if self.pending is None:
+            if not self.json_output_dir.is_dir():
+                return
+            self.pending = self._load_pending()
+        ready = [jf for jf, md_abs in self.pending.items() if os.path.exists(md_abs)]
+        for jf in ready:
+            del self.pending[jf]
+            if _update_one(jf, self.job) == _META_UPDATED:
+                self.rewritten.add(jf)
+
+
+def update_metadata(
+    cfg: dict[str, Any],
+    ctx: RunContext,
+    updated_earlier: frozenset[Path] | set[Path] = frozenset(),
+) -> Tuple[int, int, int]:
+    """
+    Returns (updated, unchanged, skipped) sidecar counts, one per sidecar.
+
+    Sidecars in updated_earlier (rewritten by _MetadataFollower during the
+    run) count as updated when this pass finds them unchanged.
+    """
+    job = _metadata_job(cfg, ctx)
+
+    files = list(_iter_json_files(ctx.json_output_dir))
+    # Each sidecar is a few KB of parse/serialize plus a write: threads overlap
+    # the file I/O, and a process pool would cost more to start and feed than
+    # the work it spreads out
+    counts = [0, 0, 0]
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        futures = {pool.submit(_update_one, jf, job): jf for jf in files}
+        for fut in as_completed(futures):
+            result = fut.result()
+            if result == _META_UNCHANGED and futures[fut] in updated_earlier:
+                result = _META_UPDATED
+            counts[result] += 1
+    return counts[_META_UPDATED], counts[_META_UNCHANGED], counts[_META_SKIPPED]
 
 def run_chunking(cfg: dict[str, Any], repo_root: Path, ctx: RunContext, cfg_path: Path) -> None:
     ch = cfg.get("chunking", {}) or {}
@@ -337,10 +805,10 @@ def run_chunking(cfg: dict[str, Any], repo_root: Path, ctx: RunContext, cfg_path
     if ch.get("write_chunk_files", False):
         cmd.append("--write-chunk-files")
 
-    env = os.environ.copy()
-    env["PIPELINE_CONFIG"] = str(cfg_path)
+    # Explicit flag instead of setting PIPELINE_CONFIG in the environment
+    cmd += ["--config", str(cfg_path)]
 
-    _run(cmd, cwd=repo_root, env=env)
+    _run(cmd, cwd=repo_root)
 
 def _resolve_runs_root(runs_root_arg: str | Path, repo_root: Path) -> Path:
     """
@@ -374,6 +842,7 @@ def run_filtering_stage(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -
       log_removed: false
       log_removed_to: "runs/.../removed.jsonl"
       max_removed_in_summary: 2000
+      workers: 8               # threads for hashing/reading files
       summary_json: "runs/.../filter_summary.json"
     """
     filtering_cfg = cfg.get("filtering") or {}
@@ -470,20 +939,27 @@ def run_filtering_stage(cfg: dict[str, Any], repo_root: Path, ctx: RunContext) -
             str(int(filtering_cfg["max_removed_in_summary"])),
         ]
 
-    env = os.environ.copy()
+    if filtering_cfg.get("workers") is not None:
+        cmd += ["--workers", str(int(filtering_cfg["workers"]))]
+
     print("::STEP:: Filtering crawled course files (pre-conversion)", flush=True)
-    _run(cmd, cwd=repo_root, env=env)
+    _run(cmd, cwd=repo_root)
 
     # Try to read the summary JSON the filterer wrote so we can embed in orchestration summary
     summary_path = Path(summary_json_path)
     if summary_path.exists():
         try:
-            return json.loads(summary_path.read_text(encoding="utf-8"))
+            return _load_json_file(summary_path)
         except Exception:
             return {"error": f"Failed to parse filter summary JSON at {summary_json_path}"}
     return None
 
-def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = None) -> int:
+def run_pipeline(
+    cfg: dict[str, Any],
+    repo_root: Path,
+    cfg_path: Path | None = None,
+    cfg_raw: bytes | None = None,
+) -> int:
     runs_root = _resolve_runs_root(cfg["run"]["runs_root"], repo_root)
     runs_root.mkdir(parents=True, exist_ok=True)
 
@@ -491,17 +967,21 @@ def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = N
     master_run_dir = (runs_root / name).resolve()
     (master_run_dir / "orchestration").mkdir(parents=True, exist_ok=True)
 
-    # Copy config used if we have a cfg_path (YAML). Otherwise write JSON snapshot.
-    if cfg_path and cfg_path.exists():
-        (master_run_dir / "orchestration" / "config_used.yml").write_text(
-            cfg_path.read_text(encoding="utf-8"),
-            encoding="utf-8"
-        )
-    else:
-        (master_run_dir / "orchestration" / "config_used.json").write_text(
-            json.dumps(cfg, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
+    # Copy config used if we have a cfg_path (YAML).
+    # cfg_raw is the YAML bytes the caller already read, so the file is not read twice.
+    if cfg_raw is not None:
+        (master_run_dir / "orchestration" / "config_used.yml").write_bytes(cfg_raw)
+    elif cfg_path and cfg_path.exists():
+        (master_run_dir / "orchestration" / "config_used.yml").write_bytes(cfg_path.read_bytes())
+
+    # JSON snapshot of the parsed config. Child stages load this instead of
+    # re-parsing the YAML; it also carries any overrides applied to cfg.
+    cfg_json_path: Path | None = master_run_dir / "orchestration" / "config_used.json"
+    try:
+        cfg_json_path.write_bytes(_dump_json_bytes(cfg))
+    except TypeError:
+        # Not JSON-serializable (e.g. YAML timestamps without orjson); children read the YAML.
+        cfg_json_path = None
 
     ctx = build_context(cfg, repo_root, master_run_dir)
 
@@ -509,11 +989,28 @@ def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = N
     steps = _get_enabled_steps(cfg)
 
     updated = 0
+    unchanged = 0
     skipped = 0
     filter_summary: Dict[str, Any] | None = None
 
+    # Optional: overlap crawl and convert. Filtering has to see the whole crawl
+    # before anything is converted, so it forces the sequential path.
+    pipelined = bool(cfg["run"].get("pipelined", False)) and {"crawl", "convert"} <= steps
+    if pipelined and "filter" in steps:
+        print("::STEP:: run.pipelined ignored because the filter step is enabled", flush=True)
+        pipelined = False
+
+    # With pipelining, sidecars start getting their markdown paths while the
+    # converter is still busy; step 4 then only has the stragglers left.
+    follower = _MetadataFollower(cfg, ctx) if pipelined and "metadata" in steps else None
+
     # 1) Crawl
-    if "crawl" in steps:
+    if pipelined:
+        print("::STEP:: Crawling the Canvas Course and converting files as they arrive", flush=True)
+        run_crawl_and_conversion_pipelined(
+            cfg, repo_root, ctx, while_converting=follower.poll if follower else None
+        )
+    elif "crawl" in steps:
         print("::STEP:: Crawling the Canvas Course and Gathering Files", flush=True)
         run_crawler(cfg, repo_root, master_run_dir)
     else:
@@ -527,7 +1024,9 @@ def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = N
         print("::STEP:: Skipping filtering (disabled via run.steps or filtering.enabled=false)", flush=True)
 
     # 3) Convert
-    if "convert" in steps:
+    if pipelined:
+        pass  # already done alongside the crawl
+    elif "convert" in steps:
         print("::STEP:: Converting files from source format to markdown", flush=True)
         run_conversion(cfg, repo_root, ctx)
     else:
@@ -536,14 +1035,16 @@ def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = N
     # 4) Update metadata
     if "metadata" in steps:
         print("::STEP:: Adding and verifying files metadata", flush=True)
-        updated, skipped = update_metadata(cfg, ctx)
+        updated, unchanged, skipped = update_metadata(
+            cfg, ctx, follower.rewritten if follower is not None else frozenset()
+        )
     else:
         print("::STEP:: Skipping metadata update (run.steps does not include 'metadata')", flush=True)
 
     # 5) Chunking
     if "chunk" in steps:
         print("::STEP:: Chunking the markdown files, preparing to upload", flush=True)
-        run_chunking(cfg, repo_root, ctx, cfg_path or (repo_root / "orchestrator" / "config.yml"))
+        run_chunking(cfg, repo_root, ctx, cfg_json_path or cfg_path or (repo_root / "orchestrator" / "config.yml"))
     else:
         print("::STEP:: Skipping chunking (disabled via run.steps or chunking.enabled=false)", flush=True)
 
@@ -556,25 +1057,24 @@ def run_pipeline(cfg: dict[str, Any], repo_root: Path, cfg_path: Path | None = N
         "markdown_root": str(ctx.markdown_root),
         "json_output_dir": str(ctx.json_output_dir),
         "updated_json_files": updated,
+        "unchanged_json_files": unchanged,
         "skipped_json_files": skipped,
         "steps": sorted(list(steps)),
         "filter_summary": filter_summary,
     }
-    (master_run_dir / "orchestration" / "summary.json").write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    (master_run_dir / "orchestration" / "summary.json").write_bytes(_dump_json_bytes(summary))
 
     print(f"\nMaster run dir: {master_run_dir}")
-    print(f"Updated JSON files: {updated} | Skipped: {skipped}")
+    print(f"Updated JSON files: {updated} | Unchanged: {unchanged} | Skipped: {skipped}")
     return 0
 
 
 def main() -> int:
     repo_root = Path(__file__).resolve().parents[1]
     cfg_path = Path(os.environ.get("PIPELINE_CONFIG", repo_root / "orchestrator" / "config.yml"))
-    cfg = _load_yaml(cfg_path)
-    return run_pipeline(cfg, repo_root, cfg_path)
+    cfg_raw = cfg_path.read_bytes()
+    cfg = _load_yaml(cfg_path, cfg_raw)
+    return run_pipeline(cfg, repo_root, cfg_path, cfg_raw)
 
 
 
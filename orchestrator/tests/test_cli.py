@@ -0,0 +1,34 @@
+import pytest
+
+from orchestrator.cli import _parse_course_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://learn.canvas.net/courses/3376", ("https://learn.canvas.net", 3376)),
+        ("https://x.com/courses/12/pages/intro?module_item_id=5#top", ("https://x.com", 12)),
+        ("https://x.com/courses/12;p", ("https://x.com", 12)),
+        ("https://x.com/courses/abc/courses/7/", ("https://x.com", 7)),
+        ("HTTPS://X.com:8443/courses/9", ("https://X.com:8443", 9)),
+        ("https://x.com/courses/12?next=/courses/99", ("https://x.com", 12)),
+    ],
+)
+def test_parse_course_url_accepts(url, expected):
+    assert _parse_course_url(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "  https://learn.canvas.net/courses/1 ",
+        "learn.canvas.net/courses/1",
+        "https:///courses/1",
+        "https://x.com/courses/12abc",
+        "https://x.com/course/12",
+        "https://x.com/?p=/courses/12",
+    ],
+)
+def test_parse_course_url_rejects(url):
+    with pytest.raises(ValueError):
+        _parse_course_url(url)
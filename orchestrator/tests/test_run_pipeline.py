@@ -0,0 +1,208 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from orchestrator import run_pipeline
+
+
+def test_iter_json_files_matches_glob(tmp_path):
+    for name in ("b.json", "a.json", ".hidden.json", "notes.txt", "x.json.bak"):
+        (tmp_path / name).write_text("{}")
+    (tmp_path / "dir.json").mkdir()
+
+    expected = sorted(p for p in tmp_path.glob("*.json") if p.is_file())
+    assert run_pipeline._iter_json_files(tmp_path) == expected
+    assert Path(tmp_path / ".hidden.json") in expected
+
+
+def test_iter_json_files_missing_dir(tmp_path):
+    assert run_pipeline._iter_json_files(tmp_path / "nope") == []
+
+
+def test_build_context_missing_run_dir(tmp_path):
+    cfg = {"canvas": {"course_id": 1}, "bridge": {"json_output_dirname": "json_output"}}
+    with pytest.raises(FileNotFoundError):
+        run_pipeline.build_context(cfg, tmp_path, tmp_path / "missing")
+
+
+_popen_events = []
+_audit_installed = False
+
+
+def _audit(event, args):
+    if event == "subprocess.Popen":
+        _popen_events.append(args)
+
+
+def test_run_inherits_environment(tmp_path):
+    # Audit hooks cannot be removed; install once and only record Popen events
+    global _audit_installed
+    if not _audit_installed:
+        sys.addaudithook(_audit)
+        _audit_installed = True
+    _popen_events.clear()
+
+    run_pipeline._run([sys.executable, "-c", "pass"], cwd=tmp_path)
+
+    (event,) = _popen_events
+    executable, args, cwd, env = event
+    assert args == [sys.executable, "-c", "pass"]
+    assert cwd == str(tmp_path)
+    # No env mapping, no shell: eligible for CPython's posix_spawn fast path
+    assert env is None
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Writes pages through the crawler's StorageManager, slowly enough that several
+# polls see the crawl in progress
+_FAKE_CRAWLER = """
+import logging, sys, time
+from canvas_crawler.canvascrawler.storage import StorageManager
+sm = StorageManager(sys.argv[1], logging.getLogger("fake_crawler"))
+for i in range(int(sys.argv[2])):
+    sm.write_html("x" * 200000, f"pages/p{i}.html")
+    sm.write_json({"type": "page", "id": i})
+    time.sleep(0.02)
+"""
+
+# Records each streamed path and whether the file was complete when it arrived
+_FAKE_CONVERTER = """
+import os, sys
+with open(sys.argv[1], "w") as out:
+    for line in sys.stdin:
+        path = line.rstrip("\\n")
+        out.write(f"{path}\\t{os.path.getsize(path)}\\n")
+"""
+
+
+def _pipelined(tmp_path, monkeypatch, crawl_cmd, conv_cmd, **kwargs):
+    master = tmp_path / "run"
+    course_root = master / "canvas" / "output" / "1"
+    course_root.mkdir(parents=True)
+    ctx = run_pipeline.RunContext(
+        repo_root=_REPO_ROOT,
+        master_run_dir=master,
+        course_root=course_root,
+        processor_dir=master / "processor",
+        markdown_root=master / "processor" / "markdown",
+        json_output_dir=course_root / "json_output",
+    )
+    cfg = {"conversion": {}, "run": {"pipeline_poll_seconds": 0.05}}
+    monkeypatch.setattr(run_pipeline, "_crawler_cmd", lambda *a: [sys.executable, "-c", *crawl_cmd(course_root)])
+    monkeypatch.setattr(run_pipeline, "_conversion_cmd", lambda *a: [sys.executable, "-c", *conv_cmd])
+    run_pipeline.run_crawl_and_conversion_pipelined(cfg, _REPO_ROOT, ctx, **kwargs)
+    return course_root
+
+
+def test_pipelined_streams_every_finished_file_once(tmp_path, monkeypatch):
+    received = tmp_path / "received.tsv"
+    course_root = _pipelined(
+        tmp_path,
+        monkeypatch,
+        lambda root: [_FAKE_CRAWLER, str(root), "30"],
+        [_FAKE_CONVERTER, str(received)],
+    )
+
+    rows = [line.split("\t") for line in received.read_text().splitlines()]
+    paths = [p for p, _ in rows]
+    assert sorted(paths) == sorted(str(course_root / "pages" / f"p{i}.html") for i in range(30))
+    assert all(size == "200000" for _, size in rows)
+    # Sidecars and in-progress .part files are never sent
+    assert not [p for p in paths if "json_output" in p or ".part" in p]
+
+
+def test_pipelined_stops_crawler_when_converter_fails(tmp_path, monkeypatch):
+    started = time.monotonic()
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        _pipelined(
+            tmp_path,
+            monkeypatch,
+            lambda root: ["import time; time.sleep(60)"],
+            ["import sys; sys.exit(3)"],
+        )
+    assert exc.value.returncode == 3
+    assert time.monotonic() - started < 30
+
+
+def test_pipelined_reports_crawler_failure(tmp_path, monkeypatch):
+    received = tmp_path / "received.tsv"
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        _pipelined(
+            tmp_path,
+            monkeypatch,
+            lambda root: ["import sys; sys.exit(5)"],
+            [_FAKE_CONVERTER, str(received)],
+        )
+    assert exc.value.returncode == 5
+    assert received.read_text() == ""
+
+
+def test_yaml_configs_parse_without_disk_cache(tmp_path, monkeypatch):
+    from chunker.config import load_config
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    cfg = tmp_path / "config.yml"
+    cfg.write_text("canvas:\n  course_id: 7\nchunking:\n  chunk_size: 10\n")
+
+    assert run_pipeline._load_yaml(cfg)["canvas"]["course_id"] == 7
+    assert run_pipeline._load_yaml(cfg, cfg.read_bytes()) == load_config(cfg)
+    assert not (tmp_path / "xdg").exists()
+
+
+def _metadata_ctx(tmp_path, n_md=200, n_missing=20, n_skipped=30):
+    master = tmp_path / "run"
+    course_root = master / "canvas" / "output" / "1"
+    json_dir = course_root / "json_output"
+    json_dir.mkdir(parents=True)
+    markdown_root = master / "processor" / "markdown"
+    (markdown_root / "pages").mkdir(parents=True)
+    for i in range(n_md + n_missing):
+        (json_dir / f"page_{i}.json").write_text(json.dumps({"id": i, "raw_file_path": f"pages/{i}.html"}))
+        if i < n_md:
+            (markdown_root / "pages" / f"{i}.md").write_text("# md")
+    for i in range(n_skipped):
+        (json_dir / f"link_{i}.json").write_text(json.dumps({"id": i}))
+    ctx = run_pipeline.RunContext(
+        repo_root=tmp_path,
+        master_run_dir=master,
+        course_root=course_root,
+        processor_dir=master / "processor",
+        markdown_root=markdown_root,
+        json_output_dir=json_dir,
+    )
+    cfg = {"bridge": {"raw_key": "raw_file_path", "md_key": "md_file_path"}}
+    return cfg, ctx
+
+
+def test_update_metadata_counts(tmp_path):
+    cfg, ctx = _metadata_ctx(tmp_path)
+
+    assert run_pipeline.update_metadata(cfg, ctx) == (220, 0, 30)
+    assert run_pipeline.update_metadata(cfg, ctx) == (0, 220, 30)
+    page = json.loads((ctx.json_output_dir / "page_3.json").read_text())
+    assert page["md_file_path"] == "processor/markdown/pages/3.md"
+    assert json.loads((ctx.json_output_dir / "page_210.json").read_text())["md_file_path"] is None
+
+
+def test_follower_rewrites_are_counted_once(tmp_path):
+    cfg, ctx = _metadata_ctx(tmp_path)
+    # An earlier pass: 200 sidecars already hold their markdown path
+    run_pipeline.update_metadata(cfg, ctx)
+
+    # Five more conversions land while the follower is polling
+    for i in range(200, 205):
+        (ctx.markdown_root / "pages" / f"{i}.md").write_text("# md")
+    follower = run_pipeline._MetadataFollower(cfg, ctx)
+    follower.poll()
+    assert follower.rewritten == {ctx.json_output_dir / f"page_{i}.json" for i in range(200, 205)}
+
+    # One of them changes again before the final pass, which rewrites it too
+    (ctx.markdown_root / "pages" / "200.md").unlink()
+    counts = run_pipeline.update_metadata(cfg, ctx, follower.rewritten)
+
+    assert counts == (5, 215, 30)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .schema import ConversionMode, ConversionResult, Engine, Outcome
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+_HASH_CHUNK = 1 << 20
+
+# Bump when the stored record layout or the key layout changes
+CACHE_FORMAT_VERSION = "1"
+
+# (content digest, lowercase suffix, engine, engine version, mode, llm model)
+CacheKey = Tuple[str, str, str, str, str, str]
+
+
+@functools.cache
+def engine_version(engine: str) -> str:
+    """Installed version of an engine's package ("" if unknown), so upgrades miss the cache."""
+    try:
+        return metadata.version(engine)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def file_digest(path: str) -> str:
+    """Hex blake2b of a file's bytes, streamed in 1 MiB chunks."""
+    h = hashlib.blake2b(digest_size=20)
+    buf = bytearray(_HASH_CHUNK)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _encode(r: ConversionResult) -> bytes:
+    record = r.to_jsonable()
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _decode(raw: bytes) -> ConversionResult:
+    d = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return ConversionResult(
+        source_path=d["source_path"],
+        mode_used=ConversionMode(d["mode_used"]),
+        outcome=Outcome(d["outcome"]),
+        engine_used=Engine(d["engine_used"]),
+        markdown=d["markdown"],
+        error=d["error"],
+        warnings=d["warnings"],
+        meta=d["meta"],
+        artifacts=d["artifacts"],
+        duration_ms=d["duration_ms"],
+        attempt=d["attempt"],
+    )
+
+
+@dataclass
+class ConversionCache:
+    """
+    Converter results on disk, one JSON file per CacheKey (content, suffix,
+    engine and its version, mode, llm model), salted with the cache format
+    version. Only OK/BLANK results are stored: failures can be transient
+    (timeouts, LLM errors) and should be retried next time.
+    """
+
+    dir: Path
+
+    def __post_init__(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: CacheKey) -> Path:
+        salted = "\0".join((CACHE_FORMAT_VERSION, *key))
+        name = hashlib.blake2b(salted.encode("utf-8"), digest_size=16).hexdigest()
+        return self.dir / name[:2] / f"{name}.json"
+
+    def get(self, key: CacheKey) -> Optional[ConversionResult]:
+        try:
+            return _decode(self._path(key).read_bytes())
+        except (OSError, ValueError, KeyError):
+            # Missing or unreadable entry: just convert again
+            return None
+
+    def put(self, key: CacheKey, result: ConversionResult) -> None:
+        if result.outcome is Outcome.FAILED:
+            return
+        path = self._path(key)
+        tmp_name = None
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp_name = tmp.name
+                tmp.write(_encode(result))
+            os.replace(tmp_name, path)
+        except OSError:
+            # Caching is best effort; the result itself is already in hand
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
@@ -22,5 +22,14 @@ class AppConfig:
     # Logging
     verbose: bool = False
 
+    # Files converted concurrently by Pipeline.run (1 = sequential)
+    workers: int = 1
+
+    # Reuse converter results keyed by file content (None = no cache)
+    cache_dir: Optional[Path] = None
+
+    # Rewrite markdown files that already exist in the run dir
+    overwrite_markdown: bool = True
+
     def get_openai_api_key(self) -> Optional[str]:
         return os.getenv(self.openai_api_key_env)
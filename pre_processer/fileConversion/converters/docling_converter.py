@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,17 +13,40 @@ from docling.document_converter import DocumentConverter  # main entry point :co
 from ..schema import ConversionMode, ConversionResult, Engine, Outcome
 
 
+# Per-thread {allowed_formats: DocumentConverter}
+_local = threading.local()
+
+
+def _converter_for(allowed_formats: Optional[tuple[Any, ...]]) -> DocumentConverter:
+    """
+    One DocumentConverter per allowed_formats per thread, shared by every
+    DoclingConverter on that thread, so Docling's heavy init is paid once per
+    thread. Converters are not documented as thread-safe, so Pipeline's worker
+    threads never share one.
+    """
+    converters = getattr(_local, "converters", None)
+    if converters is None:
+        converters = _local.converters = {}
+    conv = converters.get(allowed_formats)
+    if conv is None:
+        # Keep it simple for now: default converter auto-detects formats. :contentReference[oaicite:4]{index=4}
+        conv = DocumentConverter(allowed_formats=list(allowed_formats) if allowed_formats else None)
+        converters[allowed_formats] = conv
+    return conv
+
+
 @dataclass
 class DoclingConverter:
     logger: logging.Logger
     allowed_formats: Optional[list[Any]] = None  # keep generic; Docling has InputFormat enum
-    _converter: Optional[DocumentConverter] = None
+
+    @classmethod
+    def warmup(cls, allowed_formats: Optional[list[Any]] = None) -> None:
+        """Build the calling thread's converter up front (and fetch models) so the first file isn't charged for it."""
+        _converter_for(tuple(allowed_formats) if allowed_formats else None)
 
     def _get_converter(self) -> DocumentConverter:
-        if self._converter is None:
-            # Keep it simple for now: default converter auto-detects formats. :contentReference[oaicite:4]{index=4}
-            self._converter = DocumentConverter(allowed_formats=self.allowed_formats)
-        return self._converter
+        return _converter_for(tuple(self.allowed_formats) if self.allowed_formats else None)
 
     def convert(self, path: str, mode: ConversionMode, *, attempt: int = 1) -> ConversionResult:
         """
@@ -15,6 +15,14 @@ except Exception:  # pragma: no cover
 from ..schema import Engine, ConversionMode, ConversionResult, Outcome
 
 
+# Optional result fields copied into meta (ledger only). Bulky collections are
+# recorded by size, not by value, to keep ledger lines small.
+_RAW_ATTRS = ("metadata", "content", "tables", "images", "links", "warnings")
+_RAW_COUNT_ONLY = frozenset({"content", "tables", "images", "links"})
+
+# getattr default that tells "absent" apart from an attribute set to None
+_MISSING = object()
+
 
 class MarkItDownConverter:
     """
@@ -81,14 +89,19 @@ class MarkItDownConverter:
                 "suffix": p.suffix.lower(),
             }
 
-            # Best-effort capture of other fields (future-proofing)
-            # We keep it very conservative to avoid fragile assumptions.
-            for attr in ("metadata", "content", "tables", "images", "links", "warnings"):
-                if hasattr(raw, attr):
-                    try:
-                        meta[f"raw_{attr}"] = getattr(raw, attr)
-                    except Exception:
-                        pass
+            # Best-effort capture of other fields (future-proofing). One getattr
+            # per name (not __dict__), so properties and slots are seen too.
+            for attr in _RAW_ATTRS:
+                try:
+                    value = getattr(raw, attr, _MISSING)
+                except Exception:
+                    continue
+                if value is _MISSING:
+                    continue
+                if attr in _RAW_COUNT_ONLY and hasattr(value, "__len__"):
+                    meta[f"raw_{attr}_count"] = len(value)
+                else:
+                    meta[f"raw_{attr}"] = value
 
             dur_ms = int((time.perf_counter() - start) * 1000)
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +16,9 @@ def setup_logging(
 ) -> logging.Logger:
     """
     Console + file logging, file is timestamped per run.
+
+    The logger itself only carries a QueueHandler; a QueueListener thread
+    owns the console/file handlers and does the formatting and I/O.
     """
     level = logging.DEBUG if verbose else logging.INFO
     logs_dir.mkdir(parents=True, exist_ok=True)
@@ -42,8 +48,13 @@ def setup_logging(
     fh.setLevel(level)
     fh.setFormatter(formatter)
 
-    logger.addHandler(ch)
-    logger.addHandler(fh)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
+    # Drains anything still queued at interpreter exit
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     logger.info("Logging initialized → %s", log_path)
     return logger
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Optional
 import logging
+import os
+import time
 
+from .cache import ConversionCache, engine_version, file_digest
 from .config import AppConfig
 from .logging_utils import setup_logging
 from .policies import FallbackPolicy
@@ -26,6 +29,9 @@ class Pipeline:
     md_sink: MarkdownSink
     jsonl_sink: JsonlSink
     run_dir: Path
+    cache: Optional[ConversionCache] = None
+    # Build Docling's converter on each converting thread before its first file
+    warmup: bool = False
 
     @classmethod
     def from_config(
@@ -36,7 +42,7 @@ class Pipeline:
         source_root: Optional[Path] = None,   # NEW
     ):
         if run_dir is None:
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            ts = time.strftime("%Y%m%d_%H%M%S")
             run_dir = config.runs_root / ts
 
         logs_dir = run_dir / "logs"
@@ -62,9 +68,18 @@ class Pipeline:
             force_llm_for_pptx=config.force_llm_for_pptx,
         )
 
-        md_sink = MarkdownSink(out_dir=md_dir, logger=logger, source_root=source_root)
+        md_sink = MarkdownSink(
+            out_dir=md_dir,
+            logger=logger,
+            source_root=source_root,
+            overwrite=config.overwrite_markdown,
+        )
         jsonl_sink = JsonlSink(out_path=ledger_path, logger=logger)
 
+        cache = ConversionCache(config.cache_dir) if config.cache_dir else None
+        if cache is not None:
+            logger.info("Conversion cache → %s", cache.dir)
+
         return cls(
             config=config,
             logger=logger,
@@ -74,9 +89,45 @@ class Pipeline:
             md_sink=md_sink,
             jsonl_sink=jsonl_sink,
             run_dir=run_dir,
+            cache=cache,
+            warmup=True,
         )
 
-    def _run_step(self, step: AttemptStep, path: str, attempt: int) -> ConversionResult:
+    def _warmup_docling(self) -> None:
+        """Load the calling thread's Docling converter so its first file isn't charged for it."""
+        try:
+            DoclingConverter.warmup(self.docling.allowed_formats)
+        except Exception as e:
+            # Not fatal: convert() reports the same error per file
+            self.logger.warning("Docling warmup failed: %s", e)
+
+    def _run_step(
+        self, step: AttemptStep, path: str, attempt: int, digest: Optional[str] = None
+    ) -> ConversionResult:
+        key = None
+        if self.cache is not None and digest is not None:
+            # Suffix: engines and policies pick their handling by extension
+            key = (
+                digest,
+                os.path.splitext(path)[1].lower(),
+                step.engine.value,
+                engine_version(step.engine.value),
+                step.mode.value,
+                self.config.llm_model,
+            )
+            res = self.cache.get(key)
+            if res is not None:
+                # Same bytes may live under another name; describe this file
+                res.source_path = path
+                res.attempt = attempt
+                meta = res.meta
+                if "source_name" in meta:
+                    meta["source_name"] = os.path.basename(path)
+                if "suffix" in meta:
+                    meta["suffix"] = os.path.splitext(path)[1].lower()
+                meta["cached"] = True
+                return res
+
         if step.engine == Engine.DOCLING:
             res = self.docling.convert(path, step.mode, attempt=attempt)
         elif step.engine == Engine.MARKITDOWN:
@@ -84,46 +135,105 @@ class Pipeline:
         else:
             raise ValueError(f"Unknown engine: {step.engine}")
 
-        # Ensure engine/mode are always recorded consistently
-        res.meta = dict(res.meta or {})
-        res.meta["engine"] = step.engine.value
-        res.meta["mode"] = step.mode.value
-        return res
+        # Ensure engine/mode are always recorded consistently. Converters build a
+        # fresh meta dict per result, so it is updated in place rather than copied.
+        meta = res.meta
+        if meta is None:
+            meta = res.meta = {}
+        meta["engine"] = step.engine.value
+        meta["mode"] = step.mode.value
 
-    def run(self, paths: Iterable[str]) -> RunSummary:
-        summary = RunSummary()
+        if key is not None:
+            self.cache.put(key, res)
+        return res
 
-        for p in paths:
-            summary.total += 1
+    def _process(self, p: str) -> Optional[ConversionResult]:
+        """Try each fallback step on one file; returns the final attempt's result."""
+        # Checked once per file so quiet runs skip building the per-attempt log args
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
             self.logger.info("Processing: %s", p)
 
-            steps = self.policy.steps_to_try(p)
-            final: Optional[ConversionResult] = None
+        steps = self.policy.steps_to_try(p)
+        final: Optional[ConversionResult] = None
+
+        # Hashed once per file and shared by every attempt's cache key
+        digest: Optional[str] = None
+        if self.cache is not None:
+            try:
+                digest = file_digest(p)
+            except OSError:
+                pass  # unreadable: the converter reports it
 
-            for i, step in enumerate(steps, start=1):
-                res = self._run_step(step, p, attempt=i)
-                self.jsonl_sink.append(res)
+        for i, step in enumerate(steps, start=1):
+            res = self._run_step(step, p, attempt=i, digest=digest)
+            self.jsonl_sink.append(res)
 
+            if log_info:
                 self.logger.info(
                     "Attempt %d/%d | engine=%s | mode=%s | outcome=%s | ms=%s | path=%s",
                     i, len(steps), step.engine.value, step.mode.value, res.outcome.value, res.duration_ms, p
                 )
 
-                final = res
-                if not self.policy.should_continue(res):
-                    break
-
-            if final is None:
-                summary.failed += 1
-                continue
+            final = res
+            if not self.policy.should_continue(res):
+                break
+
+        if final is not None and final.outcome is Outcome.OK:
+            self.md_sink.write(final)
+        return final
+
+    @staticmethod
+    def _tally(summary: RunSummary, final: Optional[ConversionResult]) -> None:
+        if final is None:
+            summary.failed += 1
+        elif final.outcome is Outcome.OK:
+            summary.ok += 1
+        elif final.outcome is Outcome.BLANK:
+            summary.blank += 1
+        else:
+            summary.failed += 1
 
-            if final.outcome == Outcome.OK:
-                summary.ok += 1
-                self.md_sink.write(final)
-            elif final.outcome == Outcome.BLANK:
-                summary.blank += 1
+    def run(self, paths: Iterable[str]) -> RunSummary:
+        summary = RunSummary()
+        workers = max(1, int(self.config.workers or 1))
+
+        try:
+            if workers == 1:
+                if self.warmup:
+                    self._warmup_docling()
+                for p in paths:
+                    summary.total += 1
+                    self._tally(summary, self._process(p))
             else:
-                summary.failed += 1
+                # Conversions mostly wait on I/O or GIL-releasing parsers. Keep at
+                # most 2x workers in flight so a streamed path list is not read
+                # (and its results held) far ahead of the pool.
+                # Converters are per thread, so each pool thread warms up its own
+                with ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="convert",
+                    initializer=self._warmup_docling if self.warmup else None,
+                ) as pool:
+                    pending: set[Future] = set()
+                    for p in paths:
+                        summary.total += 1
+                        pending.add(pool.submit(self._process, p))
+                        if len(pending) >= workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for fut in done:
+                                self._tally(summary, fut.result())
+                    for fut in as_completed(pending):
+                        self._tally(summary, fut.result())
+        except BaseException:
+            # Ledger lines are buffered; make sure they hit disk even on errors,
+            # without a ledger write error replacing the one already in flight
+            try:
+                self.jsonl_sink.close()
+            except Exception:
+                self.logger.exception("Ledger writer failed while handling an earlier error")
+            raise
+        self.jsonl_sink.close()
 
         self.logger.info(
             "Run summary | total=%d ok=%d blank=%d failed=%d",
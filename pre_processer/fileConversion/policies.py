@@ -1,41 +1,52 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
-from typing import List
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
 
 from .schema import AttemptStep, ConversionMode, Engine, ConversionResult, Outcome
 
 
+_DEFAULT_PLAN = "__default__"
+
+# Every plan is one of these shared tuples; policies never build their own
+_DOCLING_LEAN = AttemptStep(Engine.DOCLING, ConversionMode.LEAN)
+_MARKITDOWN_LEAN = AttemptStep(Engine.MARKITDOWN, ConversionMode.LEAN)
+_MARKITDOWN_LLM = AttemptStep(Engine.MARKITDOWN, ConversionMode.LLM)
+
+_LEAN_ONLY = (_DOCLING_LEAN, _MARKITDOWN_LEAN)
+_LEAN_THEN_LLM = (_DOCLING_LEAN, _MARKITDOWN_LEAN, _MARKITDOWN_LLM)
+_PPTX_LLM = (_DOCLING_LEAN, _MARKITDOWN_LLM)
+
+
+def _steps_for_ext(
+    ext: str, force_llm_for_pptx: bool, enable_markitdown_llm: bool
+) -> Tuple[AttemptStep, ...]:
+    # If you still want pptx to force LLM for MarkItDown (optional)
+    if force_llm_for_pptx and ext == ".pptx":
+        return _PPTX_LLM if enable_markitdown_llm else _LEAN_ONLY
+    return _LEAN_THEN_LLM if enable_markitdown_llm else _LEAN_ONLY
+
+
 @dataclass(frozen=True)
 class FallbackPolicy:
     enable_markitdown_llm: bool = True
     force_llm_for_pptx: bool = False  # optional, keep if you still want it
+    # ext -> steps, built once; only .pptx can differ from the default plan
+    _plan: Dict[str, Tuple[AttemptStep, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        plan = {
+            ext: _steps_for_ext(ext, self.force_llm_for_pptx, self.enable_markitdown_llm)
+            for ext in (".pptx", _DEFAULT_PLAN)
+        }
+        object.__setattr__(self, "_plan", plan)
 
-    def steps_to_try(self, path: str) -> List[AttemptStep]:
-        p = Path(path)
-        ext = p.suffix.lower()
-
-        # If you still want pptx to force LLM for MarkItDown (optional)
-        if self.force_llm_for_pptx and ext == ".pptx":
-            if self.enable_markitdown_llm:
-                return [
-                    AttemptStep(Engine.DOCLING, ConversionMode.LEAN),
-                    AttemptStep(Engine.MARKITDOWN, ConversionMode.LLM),
-                ]
-            return [
-                AttemptStep(Engine.DOCLING, ConversionMode.LEAN),
-                AttemptStep(Engine.MARKITDOWN, ConversionMode.LEAN),
-            ]
-
-        steps = [
-            AttemptStep(Engine.DOCLING, ConversionMode.LEAN),
-            AttemptStep(Engine.MARKITDOWN, ConversionMode.LEAN),
-        ]
-        if self.enable_markitdown_llm:
-            steps.append(AttemptStep(Engine.MARKITDOWN, ConversionMode.LLM))
-        return steps
+    def steps_to_try(self, path: str) -> Tuple[AttemptStep, ...]:
+        ext = os.path.splitext(path)[1].lower()
+        return self._plan.get(ext) or self._plan[_DEFAULT_PLAN]
 
     def should_continue(self, result: ConversionResult) -> bool:
-        # Continue trying fallbacks if we didn't get OK.
-        return result.outcome != Outcome.OK
+        # Continue trying fallbacks if we didn't get OK. Enum members are
+        # singletons, so an identity check skips Enum.__eq__.
+        return result.outcome is not Outcome.OK
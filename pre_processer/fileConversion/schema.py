@@ -16,7 +16,8 @@ class ConversionMode(str, Enum):
     LLM = "llm"
 
 
-@dataclass(frozen=True)
+# slots=True: no per-instance __dict__ for the objects created per attempt / per run
+@dataclass(frozen=True, slots=True)
 class AttemptStep:
     engine: Engine
     mode: ConversionMode
@@ -28,7 +29,7 @@ class Outcome(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionResult:
     source_path: str
     mode_used: ConversionMode
@@ -48,6 +49,25 @@ class ConversionResult:
     duration_ms: Optional[int] = None
     attempt: int = 1  # 1-based attempt count
 
+    def to_jsonable(self) -> Dict[str, Any]:
+        """
+        Field dict for JSON encoding, enums as their values. Nested lists and
+        dicts are referenced, not copied as asdict() would.
+        """
+        return {
+            "source_path": self.source_path,
+            "mode_used": self.mode_used.value,
+            "outcome": self.outcome.value,
+            "engine_used": self.engine_used.value,
+            "markdown": self.markdown,
+            "error": self.error,
+            "warnings": self.warnings,
+            "meta": self.meta,
+            "artifacts": self.artifacts,
+            "duration_ms": self.duration_ms,
+            "attempt": self.attempt,
+        }
+
 
 @dataclass
 class RunPaths:
@@ -57,7 +77,7 @@ class RunPaths:
     out_jsonl_path: Path
 
 
-@dataclass
+@dataclass(slots=True)
 class RunSummary:
     total: int = 0
     ok: int = 0
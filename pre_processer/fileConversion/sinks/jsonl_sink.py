@@ -1,25 +1,91 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import queue
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
 from ..schema import ConversionResult
 import logging
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+# Flush the ledger every this many records so a crash loses at most a few lines
+_FLUSH_EVERY = 64
+
+# Encoded lines waiting for the writer thread; appends block once it is full
+_QUEUE_MAX = 1024
+
 
 @dataclass
 class JsonlSink:
     out_path: Path
     logger: logging.Logger
+    # One writer thread owns the file; conversion threads only encode and enqueue
+    _q: Optional[queue.Queue] = field(default=None, init=False, repr=False)
+    _writer: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _error: Optional[BaseException] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def __post_init__(self):
         self.out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def _drain(self, q: queue.Queue) -> None:
+        try:
+            with self.out_path.open("ab", buffering=1 << 20) as fh:
+                pending = 0
+                while (line := q.get()) is not None:
+                    fh.write(line)
+                    pending += 1
+                    if pending >= _FLUSH_EVERY:
+                        fh.flush()
+                        pending = 0
+        except BaseException as e:
+            self._error = e
+            # Keep consuming so producers never block on a full queue
+            while q.get() is not None:
+                pass
+
+    def _queue(self) -> queue.Queue:
+        with self._lock:
+            if self._writer is None:
+                # Started on first append and again after close()
+                self._q = queue.Queue(maxsize=_QUEUE_MAX)
+                self._writer = threading.Thread(
+                    target=self._drain, args=(self._q,), name="jsonl-sink", daemon=True
+                )
+                self._writer.start()
+            return self._q
+
     def append(self, result: ConversionResult) -> None:
-        record = asdict(result)
+        if self._error is not None:
+            raise self._error
+        record = result.to_jsonable()
         # Keep JSONL robust if meta/artifacts contain non-serializable objects
-        line = json.dumps(record, ensure_ascii=False, default=str)
-        with self.out_path.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        # Bytes straight to a binary handle: no TextIOWrapper re-encoding pass
+        if orjson is not None:
+            line = orjson.dumps(
+                record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+            )
+        else:
+            line = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        self._queue().put(line)
         self.logger.debug("Appended JSONL → %s", self.out_path)
+
+    def close(self) -> None:
+        """Write out everything queued, then stop the writer thread."""
+        with self._lock:
+            writer, q = self._writer, self._q
+            self._writer = self._q = None
+        if writer is not None:
+            q.put(None)
+            writer.join()
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
@@ -1,14 +1,63 @@
 from __future__ import annotations
 
-import re
+import os
+import threading
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from ..schema import ConversionResult
 
 
-_SAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+_SAFE_ASCII = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-"
+
+# Stand-in for an unsafe character; runs of it become one "_" in _safe_part
+_UNSAFE = "\x00"
+
+# ASCII names (the usual case) go through bytes.translate: a flat 256-byte table in C
+_ASCII_TABLE = bytes(b if b in _SAFE_ASCII else 0 for b in range(256))
+
+
+class _UnsafeTable(dict):
+    """str.translate table for non-ASCII names: unsafe characters map to _UNSAFE."""
+
+    def __missing__(self, cp: int) -> str:
+        # Only reached for non-ASCII code points, which are never safe
+        return _UNSAFE
+
+
+_SAFE_TABLE = _UnsafeTable((b, chr(_ASCII_TABLE[b])) for b in range(128))
+
+# Characters encoded per write in _write_utf8
+_WRITE_CHUNK = 1 << 20
+
+
+def _write_utf8(path: Path, text: str) -> None:
+    """
+    Write text as UTF-8, encoding at most _WRITE_CHUNK characters at a time so
+    a large document is never held as a full str and a full bytes copy at once.
+
+    The bytes go to a temp file that is renamed over path, so a crash never
+    leaves a truncated .md behind that looks like a finished conversion.
+    """
+    # Per-thread temp name: two sources can sanitize to the same output path
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            for i in range(0, len(text), _WRITE_CHUNK):
+                view = memoryview(text[i:i + _WRITE_CHUNK].encode("utf-8"))
+                while view:
+                    view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 @dataclass
@@ -16,14 +65,26 @@ class MarkdownSink:
     out_dir: Path
     logger: logging.Logger
     source_root: Path | None = None  # NEW: used to mirror directory structure
+    # False keeps an existing .md (from an earlier, completed run) as is
+    overwrite: bool = True
+    # Output dirs already created. No lock needed: a race only repeats an
+    # idempotent mkdir(exist_ok=True).
+    _seen_dirs: set[Path] = field(default_factory=set, init=False, repr=False)
 
     def __post_init__(self):
         self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._seen_dirs.add(self.out_dir)
 
     def _safe_part(self, part: str) -> str:
         # keep it stable + filesystem-friendly
         part = part.replace(" ", "_")
-        part = _SAFE_CHARS.sub("_", part)
+        if part.isascii():
+            part = part.encode("ascii").translate(_ASCII_TABLE).decode("ascii")
+        else:
+            part = part.translate(_SAFE_TABLE)
+        if _UNSAFE in part:
+            # Each run of unsafe chars becomes a single "_"; edge runs are stripped below anyway
+            part = "_".join(filter(None, part.split(_UNSAFE)))
         part = part.strip("._") or "untitled"
         return part
 
@@ -49,7 +110,9 @@ class MarkdownSink:
         return Path(*parts)
 
     def write(self, result: ConversionResult) -> Path | None:
-        if not result.markdown.strip():
+        # isspace() stops at the first non-space char and copies nothing, unlike strip()
+        md = result.markdown
+        if not md or md.isspace():
             return None
 
         rel = self._relative_source_path(result.source_path)
@@ -59,10 +122,18 @@ class MarkdownSink:
         rel_md = rel.with_suffix(".md")
 
         out_path = self.out_dir / rel_md
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-
-        out_path.write_text(result.markdown, encoding="utf-8")
-        self.logger.debug("source_root=%s", self.source_root)
-        self.logger.debug("source_path=%s", result.source_path)
-        self.logger.debug("Wrote markdown → %s", out_path)
+        if not self.overwrite and out_path.exists():
+            self.logger.debug("Keeping existing markdown → %s", out_path)
+            return out_path
+
+        parent = out_path.parent
+        if parent not in self._seen_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._seen_dirs.add(parent)
+
+        _write_utf8(out_path, md)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("source_root=%s", self.source_root)
+            self.logger.debug("source_path=%s", result.source_path)
+            self.logger.debug("Wrote markdown → %s", out_path)
         return out_path
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import os
+import sys
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 
 from dotenv import load_dotenv
 
@@ -26,6 +28,31 @@ def parse_args() -> argparse.Namespace:
         help="Root directory to mirror subfolders under markdown/. "
              "Example: --source-root runs/output/3376",
     )
+    p.add_argument(
+        "--inputs-from",
+        default=None,
+        help="Read input file paths, one per line, from this file ('-' for stdin). "
+             "Paths are converted as they are read.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Files converted concurrently (default 1 = sequential). Each worker thread "
+             "loads its own copy of Docling's layout/table models, so memory grows "
+             "with every worker.",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Reuse conversion results from this directory, keyed by file content "
+             "(shared across runs; off by default).",
+    )
+    p.add_argument(
+        "--no-overwrite",
+        action="store_true",
+        help="Keep markdown files that already exist in the run dir instead of rewriting them.",
+    )
     p.add_argument(
         "--openai-api-key",
         default=None,
@@ -33,19 +60,60 @@ def parse_args() -> argparse.Namespace:
     )
     return p.parse_args()
 
-def expand_paths(paths: List[str]) -> List[str]:
-    expanded: List[str] = []
+def _walk_files(root: str) -> Iterator[str]:
+    """
+    Yield files under root in the same order as Path(root).rglob("*"), using
+    os.scandir so DirEntry type checks need no extra stat. Symlinked dirs are
+    not descended into.
+    """
+    subdirs: List[str] = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_file():
+                yield entry.path
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+    for d in subdirs:
+        yield from _walk_files(d)
+
+
+def iter_expanded_paths(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yield resolved files for paths, walking directories. A file passed
+    directly and via its directory (or a symlink to it) is yielded once.
+    """
+    seen: set[str] = set()
 
     for p in paths:
-        path = Path(p)
-
-        if path.is_dir():
-            for child in path.rglob("*"):
-                if child.is_file():
-                    expanded.append(str(child.resolve()))  
+        if os.path.isdir(p):
+            candidates: Iterable[str] = _walk_files(p)
         else:
-            expanded.append(str(path.resolve()))          
-    return expanded
+            candidates = (p,)
+        for c in candidates:
+            resolved = os.path.realpath(c)
+            if resolved not in seen:
+                seen.add(resolved)
+                yield resolved
+
+
+def expand_paths(paths: List[str]) -> List[str]:
+    return list(iter_expanded_paths(paths))
+
+
+def iter_input_lines(src: str) -> Iterator[str]:
+    """
+    Lazily yield the paths listed one per line in src ('-' = stdin),
+    so conversion can start before the producer has finished writing.
+    """
+    fh = sys.stdin if src == "-" else open(src, "r", encoding="utf-8", buffering=1 << 20)
+    try:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
 
 
 def main() -> int:
@@ -70,9 +138,12 @@ def main() -> int:
         enable_llm_fallback=enable_llm,
         llm_model=args.model,
         verbose=args.verbose,
+        workers=max(1, args.workers),
+        cache_dir=Path(args.cache_dir).resolve() if args.cache_dir else None,
+        overwrite_markdown=not args.no_overwrite,
     )
 
-    if not args.paths:
+    if not args.paths and not args.inputs_from:
         print("No input paths provided.")
         return 2
 
@@ -81,6 +152,15 @@ def main() -> int:
         run_dir=Path(args.run_dir).resolve() if args.run_dir else None,
         source_root=Path(args.source_root).resolve() if args.source_root else None,
     )
+    if args.inputs_from:
+        print(f"Reading input paths from {args.inputs_from}.")
+        # Same expansion as positional paths, applied to each line as it arrives
+        summary = pipeline.run(
+            iter_expanded_paths(itertools.chain(args.paths, iter_input_lines(args.inputs_from)))
+        )
+        print(f"Summary: {summary.to_dict()}")
+        return 0
+
     expanded_paths = expand_paths(args.paths)
     if not expanded_paths:
         print("No files found in provided paths.")
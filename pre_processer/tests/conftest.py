@@ -0,0 +1,90 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from pre_processer.fileConversion.cache import ConversionCache
+from pre_processer.fileConversion.config import AppConfig
+from pre_processer.fileConversion.pipeline import Pipeline
+from pre_processer.fileConversion.policies import FallbackPolicy
+from pre_processer.fileConversion.schema import ConversionResult, Engine, Outcome
+from pre_processer.fileConversion.sinks.jsonl_sink import JsonlSink
+from pre_processer.fileConversion.sinks.markdown_sink import MarkdownSink
+
+
+class FakeConverter:
+    """
+    Stands in for Docling/MarkItDown: OK with "# <text>" for non-empty files,
+    BLANK for empty ones. Files named fail* raise. Every call is recorded.
+    """
+
+    allowed_formats = None
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.calls = []
+
+    def convert(self, path, mode, *, attempt=1):
+        self.calls.append(path)
+        p = Path(path)
+        if p.name.startswith("fail"):
+            raise RuntimeError(f"conversion failed: {path}")
+        text = p.read_text()
+        return ConversionResult(
+            source_path=path,
+            mode_used=mode,
+            outcome=Outcome.OK if text else Outcome.BLANK,
+            engine_used=self.engine,
+            markdown=f"# {text}" if text else "",
+            meta={"source_name": p.name, "suffix": p.suffix.lower()},
+            attempt=attempt,
+        )
+
+
+@pytest.fixture
+def docling():
+    return FakeConverter(Engine.DOCLING)
+
+
+@pytest.fixture
+def markitdown():
+    return FakeConverter(Engine.MARKITDOWN)
+
+
+@pytest.fixture
+def make_pipeline(tmp_path, docling, markitdown):
+    """
+    Build a Pipeline around the fake converters, writing to tmp_path/<run_name>.
+
+    Extra keyword arguments go to AppConfig; a cache_dir also attaches a
+    ConversionCache, as Pipeline.from_config does.
+    """
+    logger = logging.getLogger("pre_processer.tests")
+
+    def make(run_name="run", *, source_root=None, ledger_path=None, warmup=False, **config):
+        run_dir = tmp_path / run_name
+        app_config = AppConfig(runs_root=tmp_path, enable_llm_fallback=False, **config)
+        return Pipeline(
+            config=app_config,
+            logger=logger,
+            docling=docling,
+            markitdown=markitdown,
+            policy=FallbackPolicy(enable_markitdown_llm=False),
+            md_sink=MarkdownSink(out_dir=run_dir / "markdown", logger=logger, source_root=source_root),
+            jsonl_sink=JsonlSink(out_path=ledger_path or run_dir / "ledger.jsonl", logger=logger),
+            run_dir=run_dir,
+            cache=ConversionCache(app_config.cache_dir) if app_config.cache_dir else None,
+            warmup=warmup,
+        )
+
+    return make
+
+
+@pytest.fixture
+def read_ledger():
+    def read(pipe: Pipeline):
+        path = pipe.jsonl_sink.out_path
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    return read
@@ -0,0 +1,54 @@
+from pre_processer.fileConversion import pipeline as pipeline_mod
+
+
+def _run(make_pipeline, tmp_path, paths, run_name="run"):
+    pipe = make_pipeline(run_name, cache_dir=tmp_path / "cache")
+    return pipe, pipe.run([str(p) for p in paths])
+
+
+def test_cache_hit_skips_conversion(tmp_path, docling, make_pipeline, read_ledger):
+    src = tmp_path / "a.txt"
+    src.write_text("hello")
+
+    assert _run(make_pipeline, tmp_path, [src], "first")[1].ok == 1
+    pipe, summary = _run(make_pipeline, tmp_path, [src], "second")
+    assert summary.ok == 1
+
+    assert docling.calls == [str(src)]
+    (record,) = read_ledger(pipe)
+    assert record["meta"]["cached"] is True
+    assert record["markdown"] == "# hello"
+    assert list((tmp_path / "second" / "markdown").rglob("*.md"))
+
+
+def test_changed_input_misses(tmp_path, docling, make_pipeline):
+    src = tmp_path / "a.txt"
+    src.write_text("hello")
+    _run(make_pipeline, tmp_path, [src], "first")
+
+    src.write_text("hello, changed")
+    _run(make_pipeline, tmp_path, [src], "second")
+
+    assert docling.calls == [str(src), str(src)]
+
+
+def test_same_bytes_other_suffix_misses(tmp_path, docling, make_pipeline):
+    txt = tmp_path / "a.txt"
+    html = tmp_path / "a.html"
+    txt.write_text("same")
+    html.write_text("same")
+
+    _run(make_pipeline, tmp_path, [txt, html])
+
+    assert docling.calls == [str(txt), str(html)]
+
+
+def test_engine_upgrade_misses(tmp_path, docling, make_pipeline, monkeypatch):
+    src = tmp_path / "a.txt"
+    src.write_text("hello")
+    _run(make_pipeline, tmp_path, [src], "first")
+
+    monkeypatch.setattr(pipeline_mod, "engine_version", lambda engine: "999.0")
+    _run(make_pipeline, tmp_path, [src], "second")
+
+    assert docling.calls == [str(src), str(src)]
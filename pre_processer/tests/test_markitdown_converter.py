@@ -0,0 +1,55 @@
+import logging
+
+from pre_processer.fileConversion.converters import markitdown_converter
+from pre_processer.fileConversion.converters.markitdown_converter import MarkItDownConverter
+from pre_processer.fileConversion.schema import ConversionMode, Outcome
+
+
+class _SlottedResult:
+    __slots__ = ("text_content", "warnings")
+
+    def __init__(self):
+        self.text_content = "# Title"
+        self.warnings = None
+
+
+class _Result(_SlottedResult):
+    __slots__ = ("metadata",)
+
+    def __init__(self):
+        super().__init__()
+        self.metadata = {"author": "x"}
+
+    @property
+    def tables(self):
+        return [1, 2, 3]
+
+    @property
+    def images(self):
+        raise RuntimeError("lazy field failed")
+
+
+class _FakeMarkItDown:
+    def __init__(self, **kwargs):
+        pass
+
+    def convert(self, path):
+        return _Result()
+
+
+def test_raw_fields_include_properties_and_slots(tmp_path, monkeypatch):
+    monkeypatch.setattr(markitdown_converter, "MarkItDown", _FakeMarkItDown)
+    conv = MarkItDownConverter(
+        llm_api_key=None, llm_model="m", enable_llm=False, logger=logging.getLogger("test_markitdown")
+    )
+    src = tmp_path / "a.docx"
+    src.write_bytes(b"x")
+
+    res = conv.convert(str(src), ConversionMode.LEAN)
+
+    assert res.outcome is Outcome.OK
+    assert res.meta["raw_metadata"] == {"author": "x"}   # slot
+    assert res.meta["raw_tables_count"] == 3             # property
+    assert "raw_warnings" in res.meta and res.meta["raw_warnings"] is None
+    assert "raw_images_count" not in res.meta           # raising property is skipped
+    assert "raw_links_count" not in res.meta and "raw_content_count" not in res.meta
@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    ok = tmp_path / "ok.txt"
+    ok.write_text("fine")
+    return [str(ok), str(tmp_path / "fail.txt")]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_ledger_error_does_not_mask_conversion_error(tmp_path, make_pipeline, inputs, workers, caplog):
+    # A directory where the ledger file should be: the writer thread fails to open it
+    ledger_path = tmp_path / "ledger.jsonl"
+    ledger_path.mkdir()
+    pipe = make_pipeline(ledger_path=ledger_path, workers=workers)
+
+    with pytest.raises(RuntimeError, match="conversion failed"):
+        pipe.run(inputs)
+    assert "Ledger writer failed" in caplog.text
+
+
+def test_ledger_error_is_raised_on_success(tmp_path, make_pipeline, inputs):
+    ledger_path = tmp_path / "ledger.jsonl"
+    ledger_path.mkdir()
+    pipe = make_pipeline(ledger_path=ledger_path)
+
+    with pytest.raises(OSError):
+        pipe.run(inputs[:1])
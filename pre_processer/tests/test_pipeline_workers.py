@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from pre_processer.fileConversion.converters import docling_converter
+from pre_processer.fileConversion.converters.docling_converter import DoclingConverter
+
+
+def _run(make_pipeline, read_ledger, src, workers, **kwargs):
+    pipe = make_pipeline(f"run_{workers}", source_root=src, workers=workers, **kwargs)
+    summary = pipe.run(str(p) for p in sorted(src.rglob("*.txt")))
+    ledger = sorted(read_ledger(pipe), key=lambda r: (r["source_path"], r["attempt"]))
+    for record in ledger:
+        record.pop("duration_ms")
+    md_dir = pipe.run_dir / "markdown"
+    markdown = {p.relative_to(md_dir).as_posix(): p.read_text() for p in md_dir.rglob("*.md")}
+    return summary, ledger, markdown
+
+
+def test_threaded_run_matches_sequential(tmp_path, make_pipeline, read_ledger):
+    src = tmp_path / "src"
+    for i in range(30):
+        d = src / f"d{i % 4}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"f{i}.txt").write_text("" if i % 7 == 0 else f"doc {i}")
+
+    seq_summary, seq_ledger, seq_md = _run(make_pipeline, read_ledger, src, workers=1)
+    par_summary, par_ledger, par_md = _run(make_pipeline, read_ledger, src, workers=4)
+
+    assert (par_summary.total, par_summary.ok, par_summary.blank, par_summary.failed) == (
+        seq_summary.total, seq_summary.ok, seq_summary.blank, seq_summary.failed
+    )
+    assert seq_summary.total == 30 and seq_summary.blank == 5
+    assert par_ledger == seq_ledger
+    assert par_md == seq_md
+
+
+def test_docling_converter_is_per_thread(monkeypatch):
+    class FakeDocumentConverter:
+        def __init__(self, allowed_formats=None):
+            self.allowed_formats = allowed_formats
+
+    monkeypatch.setattr(docling_converter, "DocumentConverter", FakeDocumentConverter)
+    monkeypatch.setattr(docling_converter, "_local", threading.local())
+
+    main = docling_converter._converter_for(None)
+    assert docling_converter._converter_for(None) is main
+    assert docling_converter._converter_for(("pdf",)) is not main
+
+    seen = []
+    barrier = threading.Barrier(4)
+
+    def worker():
+        barrier.wait()
+        conv = docling_converter._converter_for(None)
+        assert docling_converter._converter_for(None) is conv
+        seen.append(conv)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(c) for c in seen + [main]}) == 5
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_warmup_runs_on_converting_threads(tmp_path, make_pipeline, read_ledger, monkeypatch, workers):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(12):
+        (src / f"f{i}.txt").write_text(f"doc {i}")
+    warmed = []
+    monkeypatch.setattr(
+        DoclingConverter, "warmup", classmethod(lambda cls, fmts=None: warmed.append(threading.current_thread()))
+    )
+
+    _run(make_pipeline, read_ledger, src, workers=workers, warmup=True)
+
+    if workers == 1:
+        assert warmed == [threading.main_thread()]
+    else:
+        assert warmed and threading.main_thread() not in warmed
+        assert len(warmed) == len(set(warmed)) <= workers
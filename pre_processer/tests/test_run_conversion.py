@@ -0,0 +1,124 @@
+import io
+import logging
+import os
+import sys
+
+import pytest
+
+from pre_processer import run_conversion
+from pre_processer.fileConversion.schema import ConversionMode, ConversionResult, Engine, Outcome, RunSummary
+from pre_processer.fileConversion.sinks.markdown_sink import MarkdownSink
+
+
+class _RecordingPipeline:
+    """Stands in for Pipeline: records the config and the paths it is asked to run."""
+
+    runs = []
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+    @classmethod
+    def from_config(cls, cfg, **kwargs):
+        return cls(cfg)
+
+    def run(self, paths):
+        paths = list(paths)
+        self.runs.append((self.cfg, paths))
+        return RunSummary(total=len(paths))
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    monkeypatch.setattr(run_conversion, "Pipeline", _RecordingPipeline)
+    _RecordingPipeline.runs = []
+    return _RecordingPipeline.runs
+
+
+def _main(monkeypatch, argv, stdin=""):
+    monkeypatch.setattr(sys, "argv", ["run_conversion", *argv])
+    monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+    return run_conversion.main()
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    files = [src / "b.pdf", src / "a.html", src / "sub" / "c.docx"]
+    for f in files:
+        f.write_text("x")
+    os.symlink(src / "a.html", src / "link.html")
+    monkeypatch.chdir(tmp_path)
+    # Mixed relative/absolute spellings, including a symlink, as a caller might list them
+    return ["src/b.pdf", str(src / "a.html"), "src/sub/../sub/c.docx", "src/link.html"]
+
+
+def test_inputs_from_stdin_matches_positional(monkeypatch, recorded, inputs):
+    assert _main(monkeypatch, ["--workers", "1", *inputs]) == 0
+    assert _main(monkeypatch, ["--workers", "1", "--inputs-from", "-"], "\n".join(inputs) + "\n") == 0
+
+    (_, positional), (_, streamed) = recorded
+    assert streamed == positional
+    assert len(positional) == 3  # the symlink resolves to a.html
+
+
+def test_inputs_from_file_matches_positional(tmp_path, monkeypatch, recorded, inputs):
+    listing = tmp_path / "inputs.txt"
+    listing.write_text("\r\n".join(inputs) + "\r\n\r\n")
+
+    _main(monkeypatch, inputs)
+    _main(monkeypatch, ["--inputs-from", str(listing)])
+
+    (_, positional), (_, streamed) = recorded
+    assert streamed == positional
+
+
+def test_inputs_from_stdin_expands_directories(monkeypatch, recorded, inputs):
+    argv = [*inputs, "src"]
+    _main(monkeypatch, argv)
+    _main(monkeypatch, ["--inputs-from", "-"], "\n".join(argv) + "\n")
+
+    (_, positional), (_, streamed) = recorded
+    assert streamed == positional
+    assert len(positional) == 3
+
+
+@pytest.mark.parametrize("flag, overwrite", [([], True), (["--no-overwrite"], False)])
+def test_no_overwrite_flag(monkeypatch, recorded, inputs, flag, overwrite):
+    _main(monkeypatch, [*flag, *inputs])
+    ((cfg, _),) = recorded
+    assert cfg.overwrite_markdown is overwrite
+
+
+@pytest.mark.parametrize("overwrite", [True, False])
+def test_markdown_sink_overwrite(tmp_path, overwrite):
+    sink = MarkdownSink(
+        out_dir=tmp_path / "markdown",
+        logger=logging.getLogger("test_run_conversion"),
+        source_root=tmp_path,
+        overwrite=overwrite,
+    )
+    src = str(tmp_path / "a.pdf")
+
+    def result(md):
+        return ConversionResult(
+            source_path=src, mode_used=ConversionMode.LEAN, outcome=Outcome.OK,
+            engine_used=Engine.DOCLING, markdown=md,
+        )
+
+    out = sink.write(result("# first"))
+    assert sink.write(result("# second")) == out
+    assert out.read_text() == ("# second" if overwrite else "# first")
+    assert [p.name for p in out.parent.iterdir()] == ["a.md"]
+
+
+def test_at_sign_path_is_an_input_not_an_argfile(tmp_path, monkeypatch, recorded):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "@notes.txt").write_text("--no-overwrite\n")
+
+    _main(monkeypatch, ["@notes.txt"])
+
+    ((cfg, paths),) = recorded
+    assert paths == [str(tmp_path / "@notes.txt")]
+    assert cfg.overwrite_markdown is True
@@ -42,13 +42,83 @@ Chunk Path, Remove?, Remove Reason?
 """
 
 import argparse
+import collections
+import contextlib
 import csv
+import errno
 import json
+import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Set, Tuple, Optional
 import shutil
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+CSV_FIELDNAMES = [
+    "Title",
+    "URL",
+    "Type",
+    "Module",
+    "Published?",
+    "File Path",
+    "Json Path",
+    "Chunk Path",
+    "Remove?",
+    "Remove Reason?",
+]
+
+
+def _loads(data: bytes | str) -> Any:
+    """Parse JSON with orjson when installed, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_json_bytes(obj: Any) -> bytes:
+    """
+    Serialize to indented UTF-8 JSON (orjson when installed, stdlib otherwise).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _atomic_write_bytes(path: str, payload: bytes) -> None:
+    # Already-serialized bytes straight to a temp fd, then renamed over path so
+    # a crash never leaves a truncated JSON behind. Per-thread temp name: two
+    # records can target the same Json/ file.
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+_URL_TYPE_RE = re.compile(r"/(assignments|quizzes|files|pages)(?=/)")
+_URL_TYPE_ORDER = ("assignments", "quizzes", "files", "pages")
+_URL_TYPE_MAP = {"assignments": "assignment", "quizzes": "quiz", "files": "file", "pages": "page"}
+
 
 def infer_type(url: str, meta_type: Optional[str] = None) -> Optional[str]:
     """Infer Canvas object type from URL or meta_type.
@@ -56,16 +126,14 @@ def infer_type(url: str, meta_type: Optional[str] = None) -> Optional[str]:
     Returns one of: 'assignment', 'quiz', 'page', 'file', or None.
     """
     url = url or ""
-    url_lower = url.lower()
 
-    if "/assignments/" in url_lower:
-        return "assignment"
-    if "/quizzes/" in url_lower:
-        return "quiz"
-    if "/files/" in url_lower:
-        return "file"
-    if "/pages/" in url_lower:
-        return "page"
+    # One scan of the URL; the lookahead lets "/files/pages/" match both
+    found = _URL_TYPE_RE.findall(url.lower())
+    if found:
+        if len(found) > 1:
+            # Precedence: assignments > quizzes > files > pages
+            found.sort(key=_URL_TYPE_ORDER.index)
+        return _URL_TYPE_MAP[found[0]]
 
     if meta_type:
         t = meta_type.lower()
@@ -81,23 +149,116 @@ def module_dir_for(modules_root: Path, module_name: Optional[str]) -> Path:
     If module_name is None/empty, returns Modules/No_Module_Found.
     Otherwise, splits on "/" to create nested directories.
     """
+    return Path(_module_dir_str(str(modules_root), module_name))
+
+
+def _module_dir_str(modules_root: str, module_name: Optional[str]) -> str:
     if not module_name:
-        return modules_root / "No_Module_Found"
+        return os.path.join(modules_root, "No_Module_Found")
 
     # Split on "/" and strip whitespace from each part.
     parts = [p.strip() for p in str(module_name).split("/") if p.strip()]
     if not parts:
-        return modules_root / "No_Module_Found"
+        return os.path.join(modules_root, "No_Module_Found")
+
+    # Drop "." parts, as Path joining would
+    return os.path.join(modules_root, *(p for p in parts if p != "."))
 
-    path = modules_root
-    for part in parts:
-        path = path / part
-    return path
 
+# Records share a handful of module names; hot path in _process_one
+_module_dir_cached = lru_cache(maxsize=None)(_module_dir_str)
 
-def rel_to_root(path: Path, root: Path) -> str:
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create path (and parents) once; repeat calls for the same dir are free."""
+    os.makedirs(path, exist_ok=True)
+
+
+# rename(2) failures that shutil.move knows how to handle: other filesystem,
+# or a directory already sitting at dst (shutil.move moves into it)
+_MOVE_FALLBACK_ERRNOS = (errno.EXDEV, errno.ENOTSUP, errno.EEXIST, errno.ENOTEMPTY, errno.EISDIR)
+
+
+def _fast_move(src: str, dst: str) -> bool:
+    """Move a file with a single rename(2), falling back to shutil.move.
+
+    Returns False when src no longer exists (e.g. another record already
+    moved it); callers report that per file instead of aborting the run.
+    """
+    try:
+        os.rename(src, dst)
+    except FileNotFoundError:
+        # ENOENT is also raised for a missing dst parent; only a gone src is benign
+        if os.path.lexists(src):
+            raise
+        return False
+    except OSError as e:
+        if e.errno not in _MOVE_FALLBACK_ERRNOS:
+            raise
+        shutil.move(src, dst)
+    return True
+
+
+class _SourceClaims:
+    """Hands each source path to exactly one record.
+
+    Records run concurrently and several can name the same raw file or chunk
+    dir; only the first claimant moves it, later ones see it as already moved
+    (what the sequential run observed too).
+    """
+
+    def __init__(self) -> None:
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, path: str) -> bool:
+        key = os.path.normpath(path)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+
+def _map_in_order(executor: ThreadPoolExecutor, fn, items, window: int) -> Iterator[Any]:
+    """Like executor.map, but with at most window calls submitted and not yet consumed.
+
+    Results come back in submission order. The caller streams them (CSV rows)
+    as they arrive, so memory stays bounded by the window, not by the
+    number of records.
+    """
+    pending: collections.deque = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _move_dir_into_empty(src: str, dst: str) -> bool:
+    """Rename directory src over dst in one syscall if dst is empty.
+
+    Returns False (nothing moved) when dst already has content or lives on
+    another filesystem; callers then move files one by one.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        return False
+    return True
+
+
+def rel_to_root(path: str, root: str) -> str:
     """Return POSIX-style relative path from root to path."""
-    return path.relative_to(root).as_posix()
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _norm_key(s: str) -> str:
+    # Normalize to POSIX-ish, strip leading "./"
+    return s.replace("\\", "/").lstrip("./")
+
 
 def load_removed_map(removed_path: Path) -> Dict[str, Dict[str, Any]]:
     """Load /filters/removed.jsonl into a lookup map.
@@ -112,23 +273,20 @@ def load_removed_map(removed_path: Path) -> Dict[str, Dict[str, Any]]:
     If removed.jsonl does not exist, returns empty dict.
     """
 
-    def norm_key(s: str) -> str:
-        # Normalize to POSIX-ish, strip leading "./"
-        return s.replace("\\", "/").lstrip("./")
-
     mapping: Dict[str, Dict[str, Any]] = {}
 
     if not removed_path.is_file():
         print(f"[info] No removed file found at {removed_path}, skipping removal info.", file=sys.stderr)
         return mapping
 
-    with removed_path.open("r", encoding="utf-8") as f:
-        for lineno, line in enumerate(f, start=1):
+    with removed_path.open("rb") as f:
+        # One read, then split the bytes; each line goes to the parser undecoded
+        for lineno, line in enumerate(f.read().splitlines(), start=1):
             line = line.strip()
             if not line:
                 continue
             try:
-                data = json.loads(line)
+                data = _loads(line)
             except json.JSONDecodeError as e:
                 print(f"[warn] Skipping invalid JSON on line {lineno} of {removed_path}: {e}", file=sys.stderr)
                 continue
@@ -154,19 +312,18 @@ def load_removed_map(removed_path: Path) -> Dict[str, Dict[str, Any]]:
             else:
                 reason = base_reason
 
+            # One entry object shared by both keys; the first line naming a key wins
             entry = {"remove": True, "reason": reason}
 
             # Key by json_path if present
             json_path = data.get("json_path")
             if isinstance(json_path, str) and json_path:
-                key = norm_key(json_path)
-                mapping[key] = entry
+                mapping.setdefault(_norm_key(json_path), entry)
 
             # Also key by raw content path if present
             path = data.get("path")
             if isinstance(path, str) and path:
-                key = norm_key(path)
-                mapping[key] = entry
+                mapping.setdefault(_norm_key(path), entry)
 
     print(f"[info] Loaded {len(mapping)} removal entries from {removed_path}", file=sys.stderr)
     return mapping
@@ -189,11 +346,210 @@ def autodetect_course_dir(canvas_output_root: Path) -> Path:
     return candidates[0]
 
 
-def collect_json_files(json_output_dir: Path) -> List[Path]:
+def _scandir_files(path: str) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for every regular file under path (recursive).
+
+    Uses the file type cached on each DirEntry, so no extra stat() per entry.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def collect_json_files(json_output_dir: Path) -> List[os.DirEntry]:
     """Recursively collect all JSON files under json_output_dir."""
     if not json_output_dir.is_dir():
         raise SystemExit(f"json_output directory not found at {json_output_dir}")
-    return sorted(json_output_dir.rglob("*.json"))
+    entries = [e for e in _scandir_files(str(json_output_dir)) if e.name.endswith(".json")]
+    # Compare component-wise so the order matches sorted(Path, ...)
+    entries.sort(key=lambda e: e.path.split(os.sep))
+    return entries
+
+
+def _process_one(
+    entry: os.DirEntry,
+    course_dir: str,
+    run_root: str,
+    chunk_root: str,
+    modules_root: str,
+    removed_map: Dict[str, Dict[str, Any]],
+    dry_run: bool = False,
+    skip_moves_for_removed: bool = False,
+    claims: Optional[_SourceClaims] = None,
+) -> Optional[Tuple[Any, ...]]:
+    """Relocate one record's files, rewrite its JSON and return its CSV row.
+
+    Returns None when the record is skipped. Shared state is only read, and
+    moves go through claims, so records can be processed concurrently.
+    """
+    json_file = entry.path
+    with open(json_file, "rb") as f:
+        try:
+            meta = _loads(f.read())
+        except json.JSONDecodeError as e:
+            print(f"[warn] Skipping invalid JSON file {json_file}: {e}", file=sys.stderr)
+            return None
+
+    # Original paths for removal lookup (before we mutate meta or move files)
+    orig_json_rel = rel_to_root(json_file, course_dir)  # e.g. 'json_output/assignment_14113659.json'
+    orig_raw_rel = meta.get("raw_file_path") or ""                # e.g. 'assignments/14113659.html'
+
+    object_id = meta.get("id")
+    if object_id is None:
+        print(f"[warn] JSON file {json_file} missing 'id'; skipping.", file=sys.stderr)
+        return None
+    object_id_str = str(object_id)
+
+    url = meta.get("url") or ""
+    meta_type = meta.get("type")
+    record_type = infer_type(url, meta_type)
+    if record_type is None and meta_type:
+        record_type = meta_type.lower()
+
+    module_name = meta.get("module_name")
+
+    # --- Determine removal info from removed_map (using original paths) ---
+    removal_info = None
+    # Nothing to normalize or look up when removed.jsonl is missing/empty
+    if removed_map:
+        removal_info = removed_map.get(_norm_key(orig_json_rel))
+        if removal_info is None and orig_raw_rel:
+            removal_info = removed_map.get(_norm_key(orig_raw_rel))
+
+    remove_flag = bool(removal_info["remove"]) if removal_info else False
+    remove_reason = removal_info["reason"] if removal_info else ""
+    # Removed records may leave raw/chunk files in place for a later cleanup step
+    skip_moves = skip_moves_for_removed and remove_flag
+
+    # --- Build module/id dirs ---
+    try:
+        module_dir = _module_dir_cached(modules_root, module_name)
+    except TypeError:
+        # Unhashable module_name (e.g. a list in the JSON): bypass the cache
+        module_dir = _module_dir_str(modules_root, module_name)
+    id_dir = os.path.join(module_dir, object_id_str)
+    # Run-relative form of id_dir; every output path below extends it by string
+    run_prefix = os.path.join(run_root, "")
+    if id_dir.startswith(run_prefix):
+        id_rel = id_dir[len(run_prefix):].replace(os.sep, "/")
+    else:
+        id_rel = rel_to_root(id_dir, run_root)
+
+    json_target_dir = os.path.join(id_dir, "Json")
+    raw_target_dir = os.path.join(id_dir, "Raw")
+    chunks_target_dir = os.path.join(id_dir, "Chunks")
+
+    if not dry_run:
+        _ensure_dir(json_target_dir)
+        if not skip_moves:
+            _ensure_dir(raw_target_dir)
+            _ensure_dir(chunks_target_dir)
+
+    # --- Move/copy raw file if we have a path ---
+    raw_file_rel = meta.get("raw_file_path")
+    raw_file_new_rel: str = ""
+    if skip_moves:
+        # Keep the original raw_file_path
+        pass
+    elif raw_file_rel:
+        raw_src = os.path.join(course_dir, raw_file_rel)
+        if claims is not None and not claims.claim(raw_src):
+            print(
+                f"[warn] raw_file_path {raw_src} already moved; leaving as-is for id {object_id_str}.",
+                file=sys.stderr,
+            )
+        elif os.path.isfile(raw_src):
+            raw_name = os.path.basename(raw_src)
+            raw_dst = os.path.join(raw_target_dir, raw_name)
+            if dry_run:
+                print(f"[dry-run] Would move raw file {raw_src} -> {raw_dst}", file=sys.stderr)
+                moved = True
+            else:
+                moved = _fast_move(raw_src, raw_dst)
+            if moved:
+                raw_file_new_rel = f"{id_rel}/Raw/{raw_name}"
+                meta["raw_file_path"] = raw_file_new_rel
+            else:
+                print(
+                    f"[warn] raw_file_path {raw_src} already moved; leaving as-is for id {object_id_str}.",
+                    file=sys.stderr,
+                )
+        else:
+            print(
+                f"[warn] raw_file_path {raw_src} not found for id {object_id_str}; leaving as-is.",
+                file=sys.stderr,
+            )
+    else:
+        # No raw_file_path in metadata; leave it unset
+        pass
+
+    # --- Move/copy chunk files if we can find a chunk directory ---
+    chunk_paths: List[str] = []
+    if record_type and not skip_moves:
+        chunk_src_dir = os.path.join(chunk_root, f"{record_type}_{object_id_str}")
+        if claims is not None and not claims.claim(chunk_src_dir):
+            # Another record with the same type/id already took these chunks
+            pass
+        elif os.path.isdir(chunk_src_dir):
+            # Entry paths all start with chunk_src_dir + os.sep
+            prefix_len = len(chunk_src_dir) + 1
+            chunk_files = [(e.path, e.path[prefix_len:]) for e in _scandir_files(chunk_src_dir)]
+            # Component-wise, so chunk_paths keep the same order as sorted Paths
+            chunk_files.sort(key=lambda f: f[1].split(os.sep))
+            # The whole chunk dir usually lands in a fresh Chunks/: one rename for all files
+            dir_moved = not dry_run and _move_dir_into_empty(chunk_src_dir, chunks_target_dir)
+            for path, rel_subpath in chunk_files:
+                chunk_dst = os.path.join(chunks_target_dir, rel_subpath)
+                if dry_run:
+                    print(f"[dry-run] Would move chunk file {path} -> {chunk_dst}", file=sys.stderr)
+                elif not dir_moved:
+                    if os.sep in rel_subpath:
+                        _ensure_dir(os.path.dirname(chunk_dst))
+                    if not _fast_move(path, chunk_dst):
+                        print(f"[warn] chunk file {path} already moved; skipping for id {object_id_str}.", file=sys.stderr)
+                        continue
+                chunk_paths.append(f"{id_rel}/Chunks/{rel_subpath.replace(os.sep, '/')}")
+        else:
+            # No chunk dir; fine
+            pass
+
+    meta["chunk_paths"] = chunk_paths
+    meta["removed"] = remove_flag
+    meta["remove_reason"] = remove_reason
+
+    # --- Compute new JSON path and write updated JSON ---
+    json_dst = os.path.join(json_target_dir, entry.name)
+    json_path_rel = f"{id_rel}/Json/{entry.name}"
+    meta["json_path"] = json_path_rel
+
+    if dry_run:
+        print(f"[dry-run] Would write updated JSON for id {object_id_str} to {json_dst}", file=sys.stderr)
+    else:
+        _atomic_write_bytes(json_dst, _dump_json_bytes(meta) + b"\n")
+
+        # Remove original JSON file now that the new one is in place
+        try:
+            os.unlink(json_file)
+        except OSError as e:
+            print(f"[warn] Could not delete original JSON file {json_file}: {e}", file=sys.stderr)
+
+    # --- Prepare CSV row (same order as CSV_FIELDNAMES) ---
+    return (
+        meta.get("title", ""),
+        url,
+        record_type or (meta_type or ""),
+        module_name or "No_Module_Found",
+        "TRUE" if bool(meta.get("published")) else "FALSE",
+        meta.get("raw_file_path", "") or "",
+        json_path_rel,
+        "|".join(chunk_paths),
+        "TRUE" if remove_flag else "FALSE",
+        remove_reason,
+    )
+
 
 def process_run(
     run_root: Path,
@@ -201,8 +557,13 @@ def process_run(
     removed_path: Path,
     csv_output_path: Optional[Path] = None,
     dry_run: bool = False,
+    workers: int = 1,
+    skip_moves_for_removed: bool = False,
 ) -> None:
     """Main processing function."""
+    # Directories seen by an earlier run in this process may have been removed since
+    _ensure_dir.cache_clear()
+
     canvas_output_root = run_root / "canvas" / "output"
     if course_id:
         course_dir = canvas_output_root / str(course_id)
@@ -220,7 +581,7 @@ def process_run(
 
     chunk_root = run_root / "chunker" / "chunks"
     modules_root = run_root / "Modules"
-    modules_root.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(str(modules_root))
 
     if not removed_path.is_absolute():
         removed_path = (run_root / removed_path).resolve()
@@ -233,164 +594,47 @@ def process_run(
         if not csv_output_path.is_absolute():
             csv_output_path = (run_root / csv_output_path).resolve()
 
-    csv_rows: List[Dict[str, Any]] = []
-
-    for json_file in json_files:
-        with json_file.open("r", encoding="utf-8") as f:
-            try:
-                meta = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"[warn] Skipping invalid JSON file {json_file}: {e}", file=sys.stderr)
-                continue
-
-        # Original paths for removal lookup (before we mutate meta or move files)
-        orig_json_rel = json_file.relative_to(course_dir).as_posix()  # e.g. 'json_output/assignment_14113659.json'
-        orig_raw_rel = meta.get("raw_file_path") or ""                # e.g. 'assignments/14113659.html'
-
-        object_id = meta.get("id")
-        if object_id is None:
-            print(f"[warn] JSON file {json_file} missing 'id'; skipping.", file=sys.stderr)
-            continue
-        object_id_str = str(object_id)
-
-        url = meta.get("url") or ""
-        meta_type = meta.get("type")
-        record_type = infer_type(url, meta_type)
-        if record_type is None and meta_type:
-            record_type = meta_type.lower()
-
-        module_name = meta.get("module_name")
-
-        # --- Determine removal info from removed_map (using original paths) ---
-        def _norm_key(s: str) -> str:
-            return s.replace("\\", "/").lstrip("./")
-
-        removal_info = None
-        if orig_json_rel:
-            removal_info = removed_map.get(_norm_key(orig_json_rel))
-        if removal_info is None and orig_raw_rel:
-            removal_info = removed_map.get(_norm_key(orig_raw_rel))
-
-        remove_flag = bool(removal_info["remove"]) if removal_info else False
-        remove_reason = removal_info["reason"] if removal_info else ""
-
-        # --- Build module/id dirs ---
-        module_dir = module_dir_for(modules_root, module_name)
-        id_dir = module_dir / object_id_str
-
-        json_target_dir = id_dir / "Json"
-        raw_target_dir = id_dir / "Raw"
-        chunks_target_dir = id_dir / "Chunks"
-
+    rows_written = 0
+    with contextlib.ExitStack() as stack:
+        writer = None
         if not dry_run:
-            json_target_dir.mkdir(parents=True, exist_ok=True)
-            raw_target_dir.mkdir(parents=True, exist_ok=True)
-            chunks_target_dir.mkdir(parents=True, exist_ok=True)
-
-        # --- Move/copy raw file if we have a path ---
-        raw_file_rel = meta.get("raw_file_path")
-        raw_file_new_rel: str = ""
-        if raw_file_rel:
-            raw_src = course_dir / raw_file_rel
-            if raw_src.is_file():
-                raw_dst = raw_target_dir / raw_src.name
-                if dry_run:
-                    print(f"[dry-run] Would move raw file {raw_src} -> {raw_dst}", file=sys.stderr)
-                else:
-                    raw_dst.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(raw_src), str(raw_dst))
-                raw_file_new_rel = rel_to_root(raw_dst, run_root)
-                meta["raw_file_path"] = raw_file_new_rel
-            else:
-                print(
-                    f"[warn] raw_file_path {raw_src} not found for id {object_id_str}; leaving as-is.",
-                    file=sys.stderr,
-                )
-        else:
-            # No raw_file_path in metadata; leave it unset
-            pass
-
-        # --- Move/copy chunk files if we can find a chunk directory ---
-        chunk_paths: List[str] = []
-        if record_type:
-            chunk_src_dir = chunk_root / f"{record_type}_{object_id_str}"
-            if chunk_src_dir.is_dir():
-                for path in sorted(chunk_src_dir.rglob("*")):
-                    if not path.is_file():
-                        continue
-                    rel_subpath = path.relative_to(chunk_src_dir)
-                    chunk_dst = chunks_target_dir / rel_subpath
-                    if dry_run:
-                        print(f"[dry-run] Would move chunk file {path} -> {chunk_dst}", file=sys.stderr)
-                    else:
-                        chunk_dst.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.move(str(path), str(chunk_dst))
-                    chunk_paths.append(rel_to_root(chunk_dst, run_root))
-            else:
-                # No chunk dir; fine
-                pass
-
-        meta["chunk_paths"] = chunk_paths
-        meta["removed"] = remove_flag
-        meta["remove_reason"] = remove_reason
-
-        # --- Compute new JSON path and write updated JSON ---
-        json_dst = json_target_dir / json_file.name
-        json_path_rel = rel_to_root(json_dst, run_root)
-        meta["json_path"] = json_path_rel
-
-        if dry_run:
-            print(f"[dry-run] Would write updated JSON for id {object_id_str} to {json_dst}", file=sys.stderr)
+            # Rows go straight to disk as each record is processed
+            _ensure_dir(str(csv_output_path.parent))
+            csvfile = stack.enter_context(csv_output_path.open("w", encoding="utf-8", newline=""))
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDNAMES)
+
+        job = partial(
+            _process_one,
+            course_dir=str(course_dir),
+            run_root=str(run_root),
+            chunk_root=str(chunk_root),
+            modules_root=str(modules_root),
+            removed_map=removed_map,
+            dry_run=dry_run,
+            skip_moves_for_removed=skip_moves_for_removed,
+            claims=None if dry_run else _SourceClaims(),
+        )
+        # Records are I/O bound (read, renames, write). Dry runs stay sequential
+        # so their log lines keep the file order.
+        if dry_run or workers <= 1:
+            rows = map(job, json_files)
         else:
-            with json_dst.open("w", encoding="utf-8") as out_f:
-                json.dump(meta, out_f, indent=2, ensure_ascii=False)
-                out_f.write("\n")
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            # Submission order, so the CSV order is stable; 2x workers in flight
+            rows = _map_in_order(executor, job, json_files, workers * 2)
 
-            # Remove original JSON file after moving
-            try:
-                json_file.unlink()
-            except OSError as e:
-                print(f"[warn] Could not delete original JSON file {json_file}: {e}", file=sys.stderr)
-
-        # --- Prepare CSV row ---
-        csv_rows.append(
-            {
-                "Title": meta.get("title", ""),
-                "URL": url,
-                "Type": record_type or (meta_type or ""),
-                "Module": module_name or "No_Module_Found",
-                "Published?": "TRUE" if bool(meta.get("published")) else "FALSE",
-                "File Path": meta.get("raw_file_path", "") or "",
-                "Json Path": json_path_rel,
-                "Chunk Path": "|".join(chunk_paths),
-                "Remove?": "TRUE" if remove_flag else "FALSE",
-                "Remove Reason?": remove_reason,
-            }
-        )
+        for row in rows:
+            if row is None:
+                continue
+            if writer is not None:
+                writer.writerow(row)
+            rows_written += 1
 
-    # --- Write CSV ---
     if dry_run:
         print(f"[dry-run] Would write CSV index to {csv_output_path}", file=sys.stderr)
     else:
-        csv_output_path.parent.mkdir(parents=True, exist_ok=True)
-        fieldnames = [
-            "Title",
-            "URL",
-            "Type",
-            "Module",
-            "Published?",
-            "File Path",
-            "Json Path",
-            "Chunk Path",
-            "Remove?",
-            "Remove Reason?",
-        ]
-        with csv_output_path.open("w", encoding="utf-8", newline="") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in csv_rows:
-                writer.writerow(row)
-        print(f"[info] Wrote CSV index with {len(csv_rows)} rows to {csv_output_path}", file=sys.stderr)
+        print(f"[info] Wrote CSV index with {rows_written} rows to {csv_output_path}", file=sys.stderr)
 
 
 def main() -> None:
@@ -423,6 +667,18 @@ def main() -> None:
         help="Do not move or write any files; just print what would be done.",
     )
 
+    parser.add_argument(
+        "--skip-moves-for-removed",
+        action="store_true",
+        help="Do not move raw or chunk files of records marked as removed; they keep their original paths.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Records processed concurrently (I/O bound). Default: 1 (sequential).",
+    )
+
     args = parser.parse_args()
     run_root = Path(args.run_root).resolve()
     removed_path = Path(args.removed_file)
@@ -433,6 +689,8 @@ def main() -> None:
         removed_path=removed_path,
         csv_output_path=Path(args.csv_output) if args.csv_output else None,
         dry_run=args.dry_run,
+        workers=args.workers,
+        skip_moves_for_removed=args.skip_moves_for_removed,
     )
 
 
@@ -0,0 +1,133 @@
+import csv
+import importlib.util
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "organize_modules.py"
+_spec = importlib.util.spec_from_file_location("organize_modules", _SCRIPT)
+organize_modules = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(organize_modules)
+
+
+def _make_run(root: Path, n: int = 12, shared_raw: bool = False) -> Path:
+    """Build a minimal run dir: n file records, each with a raw file and chunks."""
+    course = root / "canvas" / "output" / "1"
+    (course / "json_output").mkdir(parents=True)
+    (course / "files").mkdir()
+    for i in range(n):
+        raw_name = "shared.pdf" if shared_raw else f"{i}.pdf"
+        (course / "files" / raw_name).write_text(f"raw {i}")
+        meta = {
+            "id": i,
+            "title": f"File {i}",
+            "url": f"/courses/1/files/{i}",
+            "type": "file",
+            "module_name": f"Week {i % 3}",
+            "published": True,
+            "raw_file_path": f"files/{raw_name}",
+        }
+        (course / "json_output" / f"file_{i}.json").write_text(json.dumps(meta))
+        chunks = root / "chunker" / "chunks" / f"file_{i}"
+        chunks.mkdir(parents=True)
+        (chunks / "0.md").write_text("chunk")
+    return root
+
+
+def _read_index(root: Path):
+    with (root / "Modules" / "modules_index.csv").open(encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("workers", [2, 8])
+def test_parallel_matches_sequential(tmp_path, workers):
+    seq = _make_run(tmp_path / "seq")
+    par = _make_run(tmp_path / "par")
+    organize_modules.process_run(seq, None, Path("filters/removed.jsonl"), workers=1)
+    organize_modules.process_run(par, None, Path("filters/removed.jsonl"), workers=workers)
+
+    assert _read_index(par) == _read_index(seq)
+    moved = sorted(p.relative_to(par).as_posix() for p in (par / "Modules").rglob("*") if p.is_file())
+    expected = sorted(p.relative_to(seq).as_posix() for p in (seq / "Modules").rglob("*") if p.is_file())
+    assert moved == expected
+
+
+def test_parallel_shared_raw_file_does_not_abort(tmp_path):
+    run = _make_run(tmp_path, n=24, shared_raw=True)
+    organize_modules.process_run(run, None, Path("filters/removed.jsonl"), workers=8)
+
+    rows = _read_index(run)
+    assert len(rows) == 24
+    # Exactly one record gets the shared file; the rest keep the original path
+    moved = [r for r in rows if r["File Path"].startswith("Modules/")]
+    assert len(moved) == 1
+    assert all(r["File Path"] == "files/shared.pdf" for r in rows if r not in moved)
+    assert len(list((run / "Modules").rglob("shared.pdf"))) == 1
+    # Every record still gets its own chunks and JSON
+    assert all(r["Chunk Path"] for r in rows)
+    assert not list((run / "canvas" / "output" / "1" / "json_output").glob("*.json"))
+
+
+def test_repeat_run_recreates_removed_dirs(tmp_path):
+    run = _make_run(tmp_path / "run", n=3)
+    organize_modules.process_run(run, None, Path("filters/removed.jsonl"))
+
+    # Same paths again in the same process, after the first output was deleted
+    shutil.rmtree(run)
+    _make_run(run, n=3)
+    organize_modules.process_run(run, None, Path("filters/removed.jsonl"))
+    assert len(_read_index(run)) == 3
+    assert len(list((run / "Modules").rglob("*.json"))) == 3
+
+
+def _write_removed(run: Path, ids):
+    filters = run / "filters"
+    filters.mkdir(exist_ok=True)
+    with (filters / "removed.jsonl").open("w", encoding="utf-8") as f:
+        for i in ids:
+            f.write(json.dumps({"action": "removed", "reason": "dupe", "json_path": f"json_output/file_{i}.json"}) + "\n")
+
+
+@pytest.mark.parametrize("skip", [False, True])
+def test_skip_moves_for_removed(tmp_path, skip):
+    run = _make_run(tmp_path, n=4)
+    _write_removed(run, [1])
+    organize_modules.process_run(run, None, Path("filters/removed.jsonl"), skip_moves_for_removed=skip)
+
+    rows = {r["Title"]: r for r in _read_index(run)}
+    removed, kept = rows["File 1"], rows["File 2"]
+    assert removed["Remove?"] == "TRUE" and removed["Remove Reason?"] == "dupe"
+    assert removed["Json Path"] == "Modules/Week 1/1/Json/file_1.json"
+    assert kept["File Path"] == "Modules/Week 2/2/Raw/2.pdf"
+
+    raw_src = run / "canvas" / "output" / "1" / "files" / "1.pdf"
+    chunk_src = run / "chunker" / "chunks" / "file_1" / "0.md"
+    if skip:
+        # Removed record's files stay put and keep their original paths
+        assert removed["File Path"] == "files/1.pdf"
+        assert removed["Chunk Path"] == ""
+        assert raw_src.is_file() and chunk_src.is_file()
+        assert not (run / "Modules" / "Week 1" / "1" / "Raw").exists()
+    else:
+        assert removed["File Path"] == "Modules/Week 1/1/Raw/1.pdf"
+        assert removed["Chunk Path"] == "Modules/Week 1/1/Chunks/0.md"
+        assert not raw_src.exists() and not chunk_src.exists()
+
+
+def test_map_in_order_bounds_in_flight_records():
+    pulled = []
+
+    def items():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    with organize_modules.ThreadPoolExecutor(max_workers=4) as pool:
+        results = organize_modules._map_in_order(pool, lambda i: i * i, items(), window=8)
+        for consumed, value in enumerate(results, start=1):
+            assert value == (consumed - 1) ** 2
+            # Never more than the window submitted ahead of the consumer
+            assert len(pulled) - consumed < 8
+    assert consumed == 50